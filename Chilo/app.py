@@ -1,10 +1,11 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import json
 from typing import Optional, List, Dict
 from datetime import datetime
-import plotly.graph_objects as go
-import plotly.express as px
+from collections import OrderedDict
+from operator import itemgetter
 import os
 import db
 import importer
@@ -447,32 +448,76 @@ def main():
     elif page == "⚙️ Manage Data":
         manage_page()
 
+# Session state keys that prefill the search form; cleared once a search is submitted
+SEARCH_PREFILL_KEYS = ('quick_filter_capacity', 'history_capacity', 'history_ambient', 'history_ewt', 'history_lwt')
+
 # Initialize session state for search history
 if 'search_history' not in st.session_state:
-    st.session_state.search_history = []
+    st.session_state.search_history = OrderedDict()
 
 def add_to_search_history(capacity: float, ambient: int, ewt: float, lwt: float):
     """Add a search to history (keep last 5)."""
-    search_entry = {
+    history = st.session_state.search_history
+    key = (capacity, ambient, ewt, lwt)
+    # Remove duplicates (same search parameters)
+    history.pop(key, None)
+    history[key] = {
         'capacity': capacity,
         'ambient': ambient,
         'ewt': ewt,
         'lwt': lwt,
         'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     }
-    # Remove duplicates (same search parameters)
-    st.session_state.search_history = [
-        s for s in st.session_state.search_history 
-        if not (s['capacity'] == capacity and s['ambient'] == ambient and 
-                s['ewt'] == ewt and s['lwt'] == lwt)
-    ]
     # Add new search at the beginning
-    st.session_state.search_history.insert(0, search_entry)
+    history.move_to_end(key, last=False)
     # Keep only last 5
-    st.session_state.search_history = st.session_state.search_history[:5]
+    while len(history) > 5:
+        history.popitem(last=True)
+
+@st.cache_resource
+def get_selector() -> selector.ChillerSelector:
+    """Shared ChillerSelector instance (the selector holds no per-search state)."""
+    return selector.ChillerSelector()
+
+@st.cache_data(ttl=600, max_entries=128, show_spinner=False)
+def search_chillers(capacity_tons: float, ambient_f: int, ewt_c: float, lwt_c: float) -> Dict:
+    """Run a chiller search, cached on the search parameters."""
+    return get_selector().find_best_chillers(capacity_tons, ambient_f, ewt_c, lwt_c)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_database_stats() -> Dict:
+    """Database statistics, cached briefly since every page render needs them."""
+    return db.get_database_stats()
 
-def create_efficiency_comparison_chart(chillers: List[Dict]) -> go.Figure:
-    """Create a side-by-side efficiency comparison chart."""
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_organized_data() -> Dict:
+    """Data organized by model prefix and folder, cached briefly."""
+    return db.get_organized_data()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_all_folders() -> List[Dict]:
+    """All folders with their details, cached briefly."""
+    return db.get_all_folders()
+
+# Folder table columns shown on the stats page (the manage page also shows id)
+STATS_FOLDER_COLUMNS = tuple(col for col in db.FOLDER_DISPLAY_COLUMNS if col != 'id')
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_folder_display_dfs() -> Dict:
+    """Display columns of every folder's chillers keyed by (model_prefix, folder_name), cached briefly."""
+    return db.get_folder_display_dfs()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_ambient_counts() -> Dict[int, int]:
+    """Chiller count per available ambient temperature, cached briefly."""
+    return db.get_ambient_counts(1, 1.0)
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def create_efficiency_comparison_chart(chillers: List[Dict]) -> Optional[Dict]:
+    """
+    Create a side-by-side efficiency comparison chart.
+    Returns the figure as a plain dict, cached on the chillers compared.
+    """
     if not chillers:
         return None
     
@@ -489,66 +534,74 @@ def create_efficiency_comparison_chart(chillers: List[Dict]) -> go.Figure:
     
     models_clean, efficiencies_clean = zip(*valid_data_sorted)
     
-    fig = go.Figure(data=[
-        go.Bar(
-            x=list(models_clean),
-            y=list(efficiencies_clean),
-            marker_color='#1f77b4',
-            text=[f'{e:.3f}' for e in efficiencies_clean],
-            textposition='outside'
-        )
-    ])
-    
-    fig.update_layout(
-        title='Efficiency Comparison (kW/ton)',
-        xaxis_title='Chiller Model',
-        yaxis_title='Efficiency (kW/ton)',
-        height=700,
-        showlegend=False,
-        xaxis={'tickangle': -45},
-        margin=dict(l=50, r=50, t=50, b=100)
-    )
-    
-    return fig
+    # Plain figure dict; no plotly graph objects need to be built or validated here
+    return {
+        'data': [{
+            'type': 'bar',
+            'x': list(models_clean),
+            'y': list(efficiencies_clean),
+            'marker': {'color': '#1f77b4'},
+            'text': np.char.mod('%.3f', np.asarray(efficiencies_clean, dtype=float)).tolist(),
+            'textposition': 'outside'
+        }],
+        'layout': {
+            'title': {'text': 'Efficiency Comparison (kW/ton)'},
+            'xaxis': {'title': {'text': 'Chiller Model'}, 'tickangle': -45},
+            'yaxis': {'title': {'text': 'Efficiency (kW/ton)'}},
+            'height': 700,
+            'showlegend': False,
+            'margin': {'l': 50, 'r': 50, 't': 50, 'b': 100}
+        }
+    }
 
-def export_comparison_report(chillers: List[Dict], search_params: Dict) -> str:
-    """Generate a CSV comparison report."""
+# Export report columns and the chiller fields they are filled from, in order
+EXPORT_COLS, EXPORT_KEYS = zip(
+    ('Model', 'model'),
+    ('Manufacturer', 'manufacturer'),
+    ('Capacity (tons)', 'capacity_tons'),
+    ('Efficiency (kW/ton)', 'efficiency_kw_per_ton'),
+    ('Waterflow (USgpm)', 'waterflow_usgpm'),
+    ('Ambient (°F)', 'ambient_f'),
+    ('EWT (°C)', 'ewt_c'),
+    ('LWT (°C)', 'lwt_c'),
+    ('Unit kW', 'unit_kw'),
+    ('Compressor kW', 'compressor_kw'),
+    ('Fan kW', 'fan_kw'),
+    ('IPLV (kW/ton)', 'iplv_kw_per_ton'),
+    ('MCA (Amps)', 'mca_amps'),
+    ('Pressure Drop (psi)', 'pressure_drop_psi'),
+    ('Pressure Drop (ft.w.g)', 'pressure_drop_ftwg'),
+    ('Length (in)', 'length_in'),
+    ('Width (in)', 'width_in'),
+    ('Height (in)', 'height_in')
+)
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def export_comparison_report(chillers: List[Dict], search_params: Dict) -> Optional[bytes]:
+    """Generate a UTF-8 CSV comparison report (cached on the chillers and search parameters)."""
     if not chillers:
         return None
     
-    # Prepare data for export
-    export_data = []
-    for ch in chillers:
-        export_data.append({
-            'Model': ch.get('model', ''),
-            'Manufacturer': ch.get('manufacturer', ''),
-            'Capacity (tons)': ch.get('capacity_tons', ''),
-            'Efficiency (kW/ton)': ch.get('efficiency_kw_per_ton', ''),
-            'Waterflow (USgpm)': ch.get('waterflow_usgpm', ''),
-            'Ambient (°F)': ch.get('ambient_f', ''),
-            'EWT (°C)': ch.get('ewt_c', ''),
-            'LWT (°C)': ch.get('lwt_c', ''),
-            'Unit kW': ch.get('unit_kw', ''),
-            'Compressor kW': ch.get('compressor_kw', ''),
-            'Fan kW': ch.get('fan_kw', ''),
-            'IPLV (kW/ton)': ch.get('iplv_kw_per_ton', ''),
-            'MCA (Amps)': ch.get('mca_amps', ''),
-            'Pressure Drop (psi)': ch.get('pressure_drop_psi', ''),
-            'Pressure Drop (ft.w.g)': ch.get('pressure_drop_ftwg', ''),
-            'Length (in)': ch.get('length_in', ''),
-            'Width (in)': ch.get('width_in', ''),
-            'Height (in)': ch.get('height_in', '')
-        })
-    
-    df = pd.DataFrame(export_data)
-    csv = df.to_csv(index=False)
-    return csv
+    # Prepare data for export with a fixed column schema
+    rows = [[ch.get(key, '') for key in EXPORT_KEYS] for ch in chillers]
+    
+    df = pd.DataFrame(rows, columns=list(EXPORT_COLS))
+    # Encode once here so the download button is handed bytes on every rerun
+    return df.to_csv(index=False, lineterminator='\n').encode('utf-8')
+
+# Search form options and the index of each option
+AMBIENT_OPTS = (95, 105, 115)
+EWT_OPTS = (54, 55)
+LWT_OPTS = (44, 45)
+AMBIENT_IDX = {value: i for i, value in enumerate(AMBIENT_OPTS)}
+EWT_IDX = {value: i for i, value in enumerate(EWT_OPTS)}
+LWT_IDX = {value: i for i, value in enumerate(LWT_OPTS)}
 
 def search_page():
     """Main search interface."""
     
     # Check if database has data
-    stats = db.get_database_stats()
+    stats = cached_database_stats()
     if stats['total_chillers'] == 0:
         st.warning("No chiller model data found. Please import data first using the 'Import Data' page.")
         return
@@ -573,26 +626,25 @@ def search_page():
             st.rerun()
     with col_f4:
         if st.button("Clear Filter", use_container_width=True, key="qf_clear"):
-            if 'quick_filter_capacity' in st.session_state:
-                del st.session_state.quick_filter_capacity
+            st.session_state.pop('quick_filter_capacity', None)
             st.rerun()
     
     # Search History Section
     if st.session_state.search_history:
         with st.expander("📚 Search History (Last 5 searches)", expanded=False):
-            for i, hist in enumerate(st.session_state.search_history):
-                col_h1, col_h2, col_h3 = st.columns([3, 1, 1])
-                with col_h1:
-                    st.write(f"**Search {i+1}:** {hist['capacity']:.1f} tons @ {hist['ambient']}°F, {hist['ewt']}/{hist['lwt']}°C")
-                with col_h2:
-                    st.caption(hist['timestamp'])
-                with col_h3:
-                    if st.button("Use", key=f"history_{i}", use_container_width=True):
-                        st.session_state.history_capacity = hist['capacity']
-                        st.session_state.history_ambient = hist['ambient']
-                        st.session_state.history_ewt = hist['ewt']
-                        st.session_state.history_lwt = hist['lwt']
-                        st.rerun()
+            history = list(st.session_state.search_history.values())
+            # Read-only part as a single markdown table; only the "Use" buttons are widgets
+            st.markdown("| Search | Parameters | Time |\n|---|---|---|\n" + "\n".join(
+                f"| {i+1} | {hist['capacity']:.1f} tons @ {hist['ambient']}°F, {hist['ewt']}/{hist['lwt']}°C | {hist['timestamp']} |"
+                for i, hist in enumerate(history)
+            ))
+            for i, hist in enumerate(history):
+                if st.button(f"Use Search {i+1}", key=f"history_{i}", use_container_width=True):
+                    st.session_state.history_capacity = hist['capacity']
+                    st.session_state.history_ambient = hist['ambient']
+                    st.session_state.history_ewt = hist['ewt']
+                    st.session_state.history_lwt = hist['lwt']
+                    st.rerun()
     
     st.divider()
     
@@ -607,29 +659,9 @@ def search_page():
         elif 'history_capacity' in st.session_state:
             default_capacity = st.session_state.history_capacity
         
-        default_ambient_idx = 1  # 105°F
-        if 'history_ambient' in st.session_state:
-            ambient_options = [95, 105, 115]
-            try:
-                default_ambient_idx = ambient_options.index(st.session_state.history_ambient)
-            except:
-                pass
-        
-        default_ewt_idx = 0  # 54°C
-        if 'history_ewt' in st.session_state:
-            ewt_options = [54, 55]
-            try:
-                default_ewt_idx = ewt_options.index(st.session_state.history_ewt)
-            except:
-                pass
-        
-        default_lwt_idx = 0  # 44°C
-        if 'history_lwt' in st.session_state:
-            lwt_options = [44, 45]
-            try:
-                default_lwt_idx = lwt_options.index(st.session_state.history_lwt)
-            except:
-                pass
+        default_ambient_idx = AMBIENT_IDX.get(st.session_state.get('history_ambient'), 1)  # 105°F
+        default_ewt_idx = EWT_IDX.get(st.session_state.get('history_ewt'), 0)  # 54°C
+        default_lwt_idx = LWT_IDX.get(st.session_state.get('history_lwt'), 0)  # 44°C
         
         with col1:
             capacity_tons = st.number_input(
@@ -643,7 +675,7 @@ def search_page():
             
             ambient_f = st.selectbox(
                 "Ambient Temperature (°F)",
-                options=[95, 105, 115],
+                options=AMBIENT_OPTS,
                 index=default_ambient_idx,
                 help="Ambient temperature for chiller operation"
             )
@@ -651,14 +683,14 @@ def search_page():
         with col2:
             ewt_c = st.selectbox(
                 "Entering Water Temperature (°C)",
-                options=[54, 55],
+                options=EWT_OPTS,
                 index=default_ewt_idx,
                 help="Entering water temperature in Celsius"
             )
             
             lwt_c = st.selectbox(
                 "Leaving Water Temperature (°C)",
-                options=[44, 45],
+                options=LWT_OPTS,
                 index=default_lwt_idx,
                 help="Leaving water temperature in Celsius"
             )
@@ -667,25 +699,24 @@ def search_page():
     
     if search_button:
         # Clear session state after form submission
-        if 'quick_filter_capacity' in st.session_state:
-            del st.session_state.quick_filter_capacity
-        if 'history_capacity' in st.session_state:
-            del st.session_state.history_capacity
-            del st.session_state.history_ambient
-            del st.session_state.history_ewt
-            del st.session_state.history_lwt
+        for key in SEARCH_PREFILL_KEYS:
+            st.session_state.pop(key, None)
         # Add to search history
         add_to_search_history(capacity_tons, ambient_f, ewt_c, lwt_c)
         
         # Perform search
-        selector_obj = selector.ChillerSelector()
-        results = selector_obj.find_best_chillers(capacity_tons, ambient_f, ewt_c, lwt_c)
+        results = search_chillers(capacity_tons, ambient_f, ewt_c, lwt_c)
         
         # Store results in session state for export
         all_best_options = [results['best_option']] + results['alternatives']
         all_best_options = [opt for opt in all_best_options if opt is not None]
         st.session_state.last_search_results = {
+            'results': results,
             'chillers': all_best_options,
+            # Card display data, formatted once per search rather than on every rerun
+            'formatted': {
+                ch.get('id'): selector.ChillerSelector.format_chiller_display(ch) for ch in all_best_options
+            },
             'all_matches': results['all_matches'],
             'search_params': {
                 'capacity': capacity_tons,
@@ -695,77 +726,97 @@ def search_page():
             }
         }
         
-        # Display search summary
-        if not results['no_matches']:
-            search_summary = selector_obj.get_search_summary(results['search_info'])
-            st.markdown(f'<div class="search-summary"><strong>Search Results:</strong> {search_summary}</div>', unsafe_allow_html=True)
-        
         # Display results
-        if results['no_matches']:
-            if results['fallback_available']:
-                st.error("No chillers found for the specified ambient temperature.")
-                st.info("Available ambient temperatures in database:")
-                for fallback in results['fallback_available']:
-                    st.write(f"- {fallback['ambient_f']}°F ({fallback['count']} chillers)")
-            else:
-                st.error("No chillers found matching your criteria. Try adjusting the capacity range or import more data.")
+        display_search_results()
+
+@st.fragment
+def display_search_results():
+    """Display the last search results. Interactions inside only rerun this fragment."""
+    
+    last_search = st.session_state.last_search_results
+    results = last_search['results']
+    all_best_options = last_search['chillers']
+    search_params = last_search['search_params']
+    formatted = last_search['formatted']
+    
+    # Display search summary
+    if not results['no_matches']:
+        search_summary = get_selector().get_search_summary(results['search_info'])
+        st.markdown(f'<div class="search-summary"><strong>Search Results:</strong> {search_summary}</div>', unsafe_allow_html=True)
+    
+    # Display results
+    if results['no_matches']:
+        if results['fallback_available']:
+            st.error("No chillers found for the specified ambient temperature.")
+            st.info("Available ambient temperatures in database:")
+            for fallback in results['fallback_available']:
+                st.write(f"- {fallback['ambient_f']}°F ({fallback['count']} chillers)")
         else:
-            # Efficiency Comparison Chart
-            if all_best_options:
-                st.subheader("📊 Efficiency Comparison")
-                efficiency_chart = create_efficiency_comparison_chart(all_best_options)
-                if efficiency_chart:
-                    st.plotly_chart(efficiency_chart, use_container_width=True)
-                else:
-                    st.info("Efficiency data not available for comparison.")
+            st.error("No chillers found matching your criteria. Try adjusting the capacity range or import more data.")
+    else:
+        # Efficiency Comparison Chart
+        if all_best_options:
+            st.subheader("📊 Efficiency Comparison")
+            efficiency_chart = create_efficiency_comparison_chart(all_best_options)
+            if efficiency_chart:
+                st.plotly_chart(efficiency_chart, use_container_width=True)
+            else:
+                st.info("Efficiency data not available for comparison.")
+            st.divider()
+        
+        # Best 3 Options
+        if all_best_options:
+            st.subheader("🏆 Best 3 Options")
+            
+            # Export button
+            csv_data = export_comparison_report(all_best_options, search_params)
+            if csv_data:
+                st.download_button(
+                    label="📥 Export Comparison Report (CSV)",
+                    data=csv_data,
+                    file_name=f"chiller_comparison_{search_params['capacity']}tons_{search_params['ambient']}F.csv",
+                    mime="text/csv",
+                    use_container_width=True,
+                    key="export_btn"
+                )
                 st.divider()
             
-            # Best 3 Options
-            if all_best_options:
-                st.subheader("🏆 Best 3 Options")
-                
-                # Export button
-                csv_data = export_comparison_report(all_best_options, {
-                    'capacity': capacity_tons,
-                    'ambient': ambient_f,
-                    'ewt': ewt_c,
-                    'lwt': lwt_c
-                })
-                if csv_data:
-                    st.download_button(
-                        label="📥 Export Comparison Report (CSV)",
-                        data=csv_data,
-                        file_name=f"chiller_comparison_{capacity_tons}tons_{ambient_f}F.csv",
-                        mime="text/csv",
-                        use_container_width=True,
-                        key="export_btn"
-                    )
-                    st.divider()
-                
-                # Display the best option first
-                if results['best_option']:
-                    display_chiller_card(results['best_option'], "Best Match", "best-option")
-                
-                # Display alternatives
-                if results['alternatives']:
-                    for i, alt in enumerate(results['alternatives']):
-                        if alt:
-                            if i == 0 and len(results['alternatives']) >= 2:
-                                display_chiller_card(alt, "Higher Capacity", "alternative")
-                            elif i == 1 and len(results['alternatives']) >= 2:
-                                display_chiller_card(alt, "Lower Capacity", "alternative")
-                            else:
-                                display_chiller_card(alt, f"Option {i+2}", "alternative")
+            # Display the best option first
+            if results['best_option']:
+                display_chiller_card(results['best_option'], "Best Match", "best-option",
+                                     formatted.get(results['best_option'].get('id')))
             
-            # All matches (collapsible)
-            if len(results['all_matches']) > 3:
-                with st.expander(f"View All {len(results['all_matches'])} Matches"):
-                    display_all_matches_table(results['all_matches'])
+            # Display alternatives
+            if results['alternatives']:
+                for i, alt in enumerate(results['alternatives']):
+                    if alt:
+                        if i == 0 and len(results['alternatives']) >= 2:
+                            display_chiller_card(alt, "Higher Capacity", "alternative", formatted.get(alt.get('id')))
+                        elif i == 1 and len(results['alternatives']) >= 2:
+                            display_chiller_card(alt, "Lower Capacity", "alternative", formatted.get(alt.get('id')))
+                        else:
+                            display_chiller_card(alt, f"Option {i+2}", "alternative", formatted.get(alt.get('id')))
+        
+        # All matches (collapsible)
+        if len(results['all_matches']) > 3:
+            with st.expander(f"View All {len(results['all_matches'])} Matches"):
+                display_all_matches_table(results['all_matches'])
 
-def display_chiller_card(chiller_data: dict, title: str, card_class: str):
-    """Display a chiller card with main metrics and expandable details."""
+# Performance rows shown on a chiller card: label, details key and value format
+PERF_LABELS = ('Unit kW', 'Compressor kW', 'Fan kW', 'IPLV', 'MCA')
+PERF_KEYS = ('unit_kw', 'compressor_kw', 'fan_kw', 'iplv_kw_per_ton', 'mca_amps')
+PERF_FMT = ('{:.1f}', '{:.1f}', '{:.1f}', '{:.3f} kW/ton', '{:.0f} A')
+_perf_getter = itemgetter(*PERF_KEYS)
+
+def display_chiller_card(chiller_data: dict, title: str, card_class: str,
+                         formatted: Optional[Dict] = None):
+    """
+    Display a chiller card with main metrics and expandable details.
+    formatted is the chiller's format_chiller_display output, if already computed.
+    """
     
-    formatted = selector.ChillerSelector().format_chiller_display(chiller_data)
+    if formatted is None:
+        formatted = selector.ChillerSelector.format_chiller_display(chiller_data)
     
     with st.container():
         st.markdown(f'<div class="chiller-card {card_class}">', unsafe_allow_html=True)
@@ -829,45 +880,25 @@ def display_chiller_card(chiller_data: dict, title: str, card_class: str):
                 ("Folder", details.get('folder_name', 'N/A'))
             ]
             
-            for label, value in basic_info:
-                if value and value != 'N/A':
-                    col1, col2 = st.columns([1, 2])
-                    with col1:
-                        st.write(f"**{label}:**")
-                    with col2:
-                        st.write(value)
+            display_details_table([(label, value) for label, value in basic_info if value and value != 'N/A'])
             
             # Performance Section
             st.subheader("Performance Data")
             
-            perf_info = []
-            if details['unit_kw']:
-                perf_info.append(("Unit kW", f"{details['unit_kw']:.1f}"))
-            if details['compressor_kw']:
-                perf_info.append(("Compressor kW", f"{details['compressor_kw']:.1f}"))
-            if details['fan_kw']:
-                perf_info.append(("Fan kW", f"{details['fan_kw']:.1f}"))
-            if details['iplv_kw_per_ton']:
-                perf_info.append(("IPLV", f"{details['iplv_kw_per_ton']:.3f} kW/ton"))
-            if details['mca_amps']:
-                perf_info.append(("MCA", f"{details['mca_amps']:.0f} A"))
+            perf_info = [
+                (label, fmt.format(value))
+                for label, value, fmt in zip(PERF_LABELS, _perf_getter(details), PERF_FMT)
+                if value
+            ]
             
-            for label, value in perf_info:
-                col1, col2 = st.columns([1, 2])
-                with col1:
-                    st.write(f"**{label}:**")
-                with col2:
-                    st.write(value)
+            display_details_table(perf_info)
             
             # Physical Specs Section
             st.subheader("Physical Specifications")
             
+            physical_info = []
             if details['pressure_drop_psi'] and details['pressure_drop_ftwg']:
-                col1, col2 = st.columns([1, 2])
-                with col1:
-                    st.write("**Pressure Drop:**")
-                with col2:
-                    st.write(f"{details['pressure_drop_psi']:.1f} psi / {details['pressure_drop_ftwg']:.1f} ft.w.g")
+                physical_info.append(("Pressure Drop", f"{details['pressure_drop_psi']:.1f} psi / {details['pressure_drop_ftwg']:.1f} ft.w.g"))
             
             dims = []
             if details['length_in']:
@@ -878,43 +909,67 @@ def display_chiller_card(chiller_data: dict, title: str, card_class: str):
                 dims.append(f"H: {details['height_in']:.1f}\"")
             
             if dims:
-                col1, col2 = st.columns([1, 2])
-                with col1:
-                    st.write("**Dimensions:**")
-                with col2:
-                    st.write(' × '.join(dims))
+                physical_info.append(("Dimensions", ' × '.join(dims)))
             
             if details['notes']:
-                col1, col2 = st.columns([1, 2])
-                with col1:
-                    st.write("**Notes:**")
-                with col2:
-                    st.write(details['notes'])
+                physical_info.append(("Notes", details['notes']))
+            
+            display_details_table(physical_info)
         
         st.markdown('</div>', unsafe_allow_html=True)
 
+def display_details_table(rows: List[tuple]):
+    """Display (label, value) detail rows as a single static table."""
+    if rows:
+        details_df = pd.DataFrame([(label, str(value)) for label, value in rows], columns=['Field', 'Value'])
+        st.table(details_df.set_index('Field'))
+
+def format_number_column(values: pd.Series, fmt: str, blank_zero: bool = True) -> pd.Series:
+    """Format a numeric column with a printf-style format, showing "—" for missing (or zero) values."""
+    numbers = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+    show = ~np.isnan(numbers)
+    if blank_zero:
+        show &= numbers != 0
+    formatted = np.full(len(numbers), '—', dtype=object)
+    formatted[show] = np.char.mod(fmt, numbers[show])
+    return pd.Series(formatted, index=values.index)
+
+# Rows per page of the all matches table
+MATCHES_PAGE_SIZE = 50
+
 def display_all_matches_table(all_matches: list):
-    """Display all matches in a table format."""
+    """Display all matches in a table format, one page of rows at a time."""
     
     if not all_matches:
         st.write("No matches found.")
         return
     
-    # Create DataFrame for display
-    display_data = []
-    for chiller in all_matches:
-        formatted = selector.ChillerSelector().format_chiller_display(chiller)
-        display_data.append({
-            'Rank': chiller.get('_rank', ''),
-            'Model': formatted['details']['model'],
-            'Capacity (tons)': f"{formatted['capacity_tons']:.1f}" if formatted['capacity_tons'] else "—",
-            'Efficiency (kW/ton)': f"{formatted['efficiency_kw_per_ton']:.3f}" if formatted['efficiency_kw_per_ton'] else "—",
-            'Waterflow (USgpm)': f"{formatted['waterflow_usgpm']:.1f}" if formatted['waterflow_usgpm'] else "—",
-            'Ambient': f"{chiller.get('ambient_f', '')}°F" if chiller.get('ambient_f') else "—",
-            'Cap Delta': f"{chiller.get('_cap_delta', 0):.1f}" if chiller.get('_cap_delta') is not None else "—"
-        })
-    
-    df = pd.DataFrame(display_data)
+    # Matches are already in rank order; only the current page is formatted and sent
+    start = 0
+    page_count = -(-len(all_matches) // MATCHES_PAGE_SIZE)
+    if page_count > 1:
+        page = st.number_input(f"Page (1–{page_count})", min_value=1, max_value=page_count,
+                               value=1, step=1, key="all_matches_page")
+        start = (page - 1) * MATCHES_PAGE_SIZE
+        st.caption(f"Showing matches {start + 1}–{min(start + MATCHES_PAGE_SIZE, len(all_matches))} of {len(all_matches)}")
+    page_matches = all_matches[start:start + MATCHES_PAGE_SIZE]
+    
+    # Build the table column-wise from the match records
+    matches = pd.DataFrame(page_matches, index=range(start, start + len(page_matches)), dtype=object).reindex(
+        columns=['_rank', 'model', 'capacity_tons', 'efficiency_kw_per_ton', 'waterflow_usgpm', 'ambient_f', '_cap_delta']
+    )
+    ambient = matches['ambient_f']
+    has_ambient = (ambient.notna() & (ambient != 0)).to_numpy()
+    
+    df = pd.DataFrame({
+        'Rank': matches['_rank'].mask(matches['_rank'].isna(), ''),
+        'Model': matches['model'].mask(matches['model'].isna(), 'Unknown'),
+        'Capacity (tons)': format_number_column(matches['capacity_tons'], '%.1f'),
+        'Efficiency (kW/ton)': format_number_column(matches['efficiency_kw_per_ton'], '%.3f'),
+        'Waterflow (USgpm)': format_number_column(matches['waterflow_usgpm'], '%.1f'),
+        'Ambient': np.where(has_ambient, ambient.astype(str) + '°F', '—'),
+        'Cap Delta': format_number_column(matches['_cap_delta'], '%.1f', blank_zero=False)
+    })
     st.dataframe(df, use_container_width=True)
 
 def import_page():
@@ -1018,13 +1073,13 @@ def import_page():
                     st.error(f"❌ {error}")
             
             if imported_count > 0:
+                st.cache_data.clear()  # Cached searches may now be out of date
                 st.success(f"✅ Successfully imported {imported_count} chiller records!")
                 st.balloons()  # Celebration animation!
                 st.info("💡 Go to 'Database Stats' to see your imported data.")
                 # Clear parsed data after import
                 del st.session_state['parsed_df']
-                if 'parsed_errors' in st.session_state:
-                    del st.session_state['parsed_errors']
+                st.session_state.pop('parsed_errors', None)
                 st.rerun()
             else:
                 st.error("❌ No records were imported. Check the errors above.")
@@ -1079,16 +1134,13 @@ def import_page():
             
             if st.button("Import File", type="primary", use_container_width=True):
                 with st.spinner("Importing file..."):
-                    # Save uploaded file temporarily
-                    with open("temp_upload.csv", "wb") as f:
-                        f.write(uploaded_file.getbuffer())
-                    
-                    # Import from file
-                    imported_count, errors = importer.import_from_file(
-                        "temp_upload.csv",
+                    # Import straight from the uploaded bytes
+                    imported_count, errors = importer.import_from_buffer(
+                        uploaded_file.getvalue(),
                         ambient_f=file_ambient,
                         ewt_c=file_ewt,
-                        lwt_c=file_lwt
+                        lwt_c=file_lwt,
+                        file_name=uploaded_file.name
                     )
                 
                 if errors:
@@ -1096,6 +1148,7 @@ def import_page():
                         st.error(f"❌ {error}")
                 
                 if imported_count > 0:
+                    st.cache_data.clear()  # Cached searches may now be out of date
                     st.success(f"✅ Successfully imported {imported_count} chiller records!")
                     st.balloons()  # Celebration animation!
                     st.info("💡 Go to 'Database Stats' to see your imported data.")
@@ -1109,26 +1162,27 @@ def stats_page():
     st.header("Database Statistics")
     
     # Get database stats
-    stats = db.get_database_stats()
+    stats = cached_database_stats()
     
     # Display metrics
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Chiller Types", len(db.get_organized_data()))
+        st.metric("Chiller Types", len(cached_organized_data()))
     
     with col2:
         st.metric("Total Models", stats['total_chillers'])
     
     with col3:
-        st.metric("Temperature Folders", len(db.get_all_folders()))
+        st.metric("Temperature Folders", len(cached_all_folders()))
     
     # Show organized data by manufacturer and folder
     if stats['total_chillers'] > 0:
         st.subheader("📁 Data Organization")
         
-        organized_data = db.get_organized_data()
-        all_folders = db.get_all_folders()
+        organized_data = cached_organized_data()
+        all_folders = cached_all_folders()
+        folder_display_dfs = None
         
         if organized_data:
             for model_prefix, model_data in organized_data.items():
@@ -1152,13 +1206,12 @@ def stats_page():
                         
                         # Show folder details if requested
                         if st.session_state.get(f"view_folder_{model_prefix}_{folder_name}", False):
-                            folder_chillers = db.get_chillers_by_folder(model_prefix, folder_name)
-                            if folder_chillers:
-                                folder_df = pd.DataFrame(folder_chillers)
-                                display_cols = ['model', 'capacity_tons', 'efficiency_kw_per_ton', 'waterflow_usgpm']
-                                available_cols = [col for col in display_cols if col in folder_df.columns]
-                                if available_cols:
-                                    st.dataframe(folder_df[available_cols], use_container_width=True)
+                            # All folders are loaded in one query, the first time any folder is open
+                            if folder_display_dfs is None:
+                                folder_display_dfs = cached_folder_display_dfs()
+                            folder_df = folder_display_dfs.get((model_prefix, folder_name))
+                            if folder_df is not None:
+                                st.dataframe(folder_df, use_container_width=True, column_order=STATS_FOLDER_COLUMNS)
                             
                             if st.button("Close", key=f"close_{model_prefix}_{folder_name}"):
                                 st.session_state[f"view_folder_{model_prefix}_{folder_name}"] = False
@@ -1167,11 +1220,10 @@ def stats_page():
             st.info("No organized data found. Import some data to see the folder structure.")
     
     # Show available ambients
-    available_ambients = db.get_available_ambients()
-    if available_ambients:
+    ambient_counts = cached_ambient_counts()
+    if ambient_counts:
         st.subheader("🌡️ Available Ambient Temperatures")
-        for ambient in available_ambients:
-            count = len(db.get_chillers_by_criteria(1, ambient, None, None, 1.0))  # Get count for this ambient
+        for ambient, count in ambient_counts.items():
             st.write(f"- {ambient}°F: {count} chillers")
 
 def manage_page():
@@ -1180,13 +1232,13 @@ def manage_page():
     st.header("⚙️ Manage Data")
     
     # Check if database has data
-    stats = db.get_database_stats()
+    stats = cached_database_stats()
     if stats['total_chillers'] == 0:
         st.warning("No chiller model data found. Please import data first using the 'Import Data' page.")
         return
     
     # Get organized data
-    organized_data = db.get_organized_data()
+    organized_data = cached_organized_data()
     
     if not organized_data:
         st.info("No organized data found. Import some data first.")
@@ -1195,6 +1247,9 @@ def manage_page():
     # Display overview
     st.subheader("📁 Folder Overview")
     
+    # Records of every folder, from a single query
+    folder_display_dfs = cached_folder_display_dfs()
+    
     # Show each model prefix and its folders
     for model_prefix, model_data in organized_data.items():
         manufacturer = model_data.get('manufacturer', 'Unknown')
@@ -1204,126 +1259,126 @@ def manage_page():
         
         for folder_name, folder_data in folders.items():
             with st.expander(f"📂 {folder_name} ({folder_data['count']} models)", expanded=False):
-                # Show folder actions
-                col1, col2, col3 = st.columns([2, 1, 1])
-                
-                with col1:
-                    st.write(f"**Folder:** {folder_name}")
-                    st.caption(f"Models: {', '.join(folder_data['models'][:10])}{'...' if len(folder_data['models']) > 10 else ''}")
-                
-                with col2:
-                    # Edit folder name button
-                    if st.button("✏️ Edit Folder", key=f"edit_{model_prefix}_{folder_name}"):
-                        st.session_state[f"editing_{model_prefix}_{folder_name}"] = True
-                
-                with col3:
-                    # Delete folder button
-                    if st.button("🗑️ Delete Folder", key=f"delete_folder_{model_prefix}_{folder_name}"):
-                        st.session_state[f"confirm_delete_folder_{model_prefix}_{folder_name}"] = True
-                
-                # Edit folder name interface
-                if st.session_state.get(f"editing_{model_prefix}_{folder_name}", False):
-                    st.markdown("---")
-                    new_folder_name = st.text_input(
-                        "New Folder Name:",
-                        value=folder_name,
-                        key=f"new_name_{model_prefix}_{folder_name}"
-                    )
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        if st.button("✓ Save", key=f"save_{model_prefix}_{folder_name}"):
-                            if new_folder_name and new_folder_name != folder_name:
-                                if db.update_folder_name(model_prefix, folder_name, new_folder_name):
-                                    st.success(f"Folder renamed successfully!")
-                                    st.session_state[f"editing_{model_prefix}_{folder_name}"] = False
-                                    st.rerun()
-                                else:
-                                    st.error("Failed to rename folder.")
-                            else:
-                                st.warning("Please enter a different folder name.")
-                    with col2:
-                        if st.button("✗ Cancel", key=f"cancel_{model_prefix}_{folder_name}"):
-                            st.session_state[f"editing_{model_prefix}_{folder_name}"] = False
-                            st.rerun()
-                
-                # Confirm delete folder
-                if st.session_state.get(f"confirm_delete_folder_{model_prefix}_{folder_name}", False):
-                    st.markdown("---")
-                    st.warning(f"⚠️ Are you sure you want to delete the entire folder '{folder_name}'? This will delete {folder_data['count']} record(s).")
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        if st.button("✓ Yes, Delete Folder", key=f"confirm_delete_{model_prefix}_{folder_name}", type="primary"):
-                            deleted_count = db.delete_folder(model_prefix, folder_name)
-                            st.success(f"Deleted folder '{folder_name}' ({deleted_count} records)")
-                            st.session_state[f"confirm_delete_folder_{model_prefix}_{folder_name}"] = False
-                            st.rerun()
-                    with col2:
-                        if st.button("✗ Cancel", key=f"cancel_delete_{model_prefix}_{folder_name}"):
-                            st.session_state[f"confirm_delete_folder_{model_prefix}_{folder_name}"] = False
-                            st.rerun()
-                
-                # Show individual records in this folder
-                st.markdown("---")
-                st.write("**Records in this folder:**")
-                
-                folder_chillers = db.get_chillers_by_folder(model_prefix, folder_name)
-                if folder_chillers:
-                    # Create a DataFrame for display
-                    display_df = pd.DataFrame(folder_chillers)
-                    
-                    # Select columns to display
-                    display_cols = ['id', 'model', 'capacity_tons', 'efficiency_kw_per_ton', 'waterflow_usgpm']
-                    available_cols = [col for col in display_cols if col in display_df.columns]
-                    
-                    if available_cols:
-                        # Display the table
-                        st.dataframe(
-                            display_df[available_cols],
-                            use_container_width=True,
-                            hide_index=True
-                        )
-                        
-                        # Delete individual records
-                        st.markdown("**Delete Individual Records:**")
-                        delete_ids = st.multiselect(
-                            f"Select records to delete from {folder_name}:",
-                            options=display_df['id'].tolist(),
-                            format_func=lambda x: f"{display_df[display_df['id']==x]['model'].iloc[0]} (ID: {x})",
-                            key=f"delete_select_{model_prefix}_{folder_name}"
-                        )
-                        
-                        if delete_ids:
-                            if st.button(f"🗑️ Delete {len(delete_ids)} Selected Record(s)", key=f"delete_records_{model_prefix}_{folder_name}", type="primary"):
-                                deleted_count = 0
-                                for chiller_id in delete_ids:
-                                    if db.delete_chiller(chiller_id):
-                                        deleted_count += 1
-                                
-                                if deleted_count > 0:
-                                    st.success(f"Successfully deleted {deleted_count} record(s)")
-                                    st.rerun()
-                                else:
-                                    st.error("Failed to delete records.")
-                
-                # Quick delete by ID
-                st.markdown("---")
-                st.write("**Quick Delete by ID:**")
-                delete_id = st.number_input(
-                    f"Enter record ID to delete from {folder_name}:",
-                    min_value=1,
-                    key=f"quick_delete_{model_prefix}_{folder_name}"
-                )
-                if st.button("Delete", key=f"quick_delete_btn_{model_prefix}_{folder_name}"):
-                    # Verify the record belongs to this folder
-                    chiller = db.get_chiller_by_id(delete_id)
-                    if chiller and chiller.get('model_prefix') == model_prefix and chiller.get('folder_name') == folder_name:
-                        if db.delete_chiller(delete_id):
-                            st.success(f"Record ID {delete_id} deleted successfully")
-                            st.rerun()
-                        else:
-                            st.error("Failed to delete record.")
+                folder_panel(model_prefix, folder_name, folder_data,
+                             folder_display_dfs.get((model_prefix, folder_name)))
+
+@st.fragment
+def folder_panel(model_prefix: str, folder_name: str, folder_data: Dict,
+                 display_df: Optional[pd.DataFrame]):
+    """
+    Actions and records for one folder on the manage page.
+    UI-only interactions rerun just this fragment; changes to the data rerun the whole app.
+    display_df holds the folder's records (None if it has none).
+    """
+    # Show folder actions
+    col1, col2, col3 = st.columns([2, 1, 1])
+    
+    with col1:
+        st.write(f"**Folder:** {folder_name}")
+        st.caption(f"Models: {', '.join(folder_data['models'][:10])}{'...' if len(folder_data['models']) > 10 else ''}")
+    
+    with col2:
+        # Edit folder name button
+        if st.button("✏️ Edit Folder", key=f"edit_{model_prefix}_{folder_name}"):
+            st.session_state[f"editing_{model_prefix}_{folder_name}"] = True
+    
+    with col3:
+        # Delete folder button
+        if st.button("🗑️ Delete Folder", key=f"delete_folder_{model_prefix}_{folder_name}"):
+            st.session_state[f"confirm_delete_folder_{model_prefix}_{folder_name}"] = True
+    
+    # Edit folder name interface
+    if st.session_state.get(f"editing_{model_prefix}_{folder_name}", False):
+        st.markdown("---")
+        new_folder_name = st.text_input(
+            "New Folder Name:",
+            value=folder_name,
+            key=f"new_name_{model_prefix}_{folder_name}"
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("✓ Save", key=f"save_{model_prefix}_{folder_name}"):
+                if new_folder_name and new_folder_name != folder_name:
+                    if db.update_folder_name(model_prefix, folder_name, new_folder_name):
+                        st.cache_data.clear()
+                        st.success(f"Folder renamed successfully!")
+                        st.session_state[f"editing_{model_prefix}_{folder_name}"] = False
+                        st.rerun()
                     else:
-                        st.error(f"Record ID {delete_id} does not belong to this folder.")
+                        st.error("Failed to rename folder.")
+                else:
+                    st.warning("Please enter a different folder name.")
+        with col2:
+            if st.button("✗ Cancel", key=f"cancel_{model_prefix}_{folder_name}"):
+                st.session_state[f"editing_{model_prefix}_{folder_name}"] = False
+                st.rerun(scope="fragment")
+    
+    # Confirm delete folder
+    if st.session_state.get(f"confirm_delete_folder_{model_prefix}_{folder_name}", False):
+        st.markdown("---")
+        st.warning(f"⚠️ Are you sure you want to delete the entire folder '{folder_name}'? This will delete {folder_data['count']} record(s).")
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("✓ Yes, Delete Folder", key=f"confirm_delete_{model_prefix}_{folder_name}", type="primary"):
+                deleted_count = db.delete_folder(model_prefix, folder_name)
+                st.cache_data.clear()
+                st.success(f"Deleted folder '{folder_name}' ({deleted_count} records)")
+                st.session_state[f"confirm_delete_folder_{model_prefix}_{folder_name}"] = False
+                st.rerun()
+        with col2:
+            if st.button("✗ Cancel", key=f"cancel_delete_{model_prefix}_{folder_name}"):
+                st.session_state[f"confirm_delete_folder_{model_prefix}_{folder_name}"] = False
+                st.rerun(scope="fragment")
+    
+    # Show individual records in this folder
+    st.markdown("---")
+    st.write("**Records in this folder:**")
+    
+    if display_df is not None:
+        # Display the table
+        st.dataframe(
+            display_df,
+            use_container_width=True,
+            hide_index=True
+        )
+        
+        # Delete individual records
+        st.markdown("**Delete Individual Records:**")
+        model_by_id = dict(zip(display_df['id'].tolist(), display_df['model'].tolist()))
+        delete_ids = st.multiselect(
+            f"Select records to delete from {folder_name}:",
+            options=list(model_by_id),
+            format_func=lambda x: f"{model_by_id[x]} (ID: {x})",
+            key=f"delete_select_{model_prefix}_{folder_name}"
+        )
+        
+        if delete_ids:
+            if st.button(f"🗑️ Delete {len(delete_ids)} Selected Record(s)", key=f"delete_records_{model_prefix}_{folder_name}", type="primary"):
+                deleted_count = db.delete_chillers_in_folder(delete_ids, model_prefix, folder_name)
+                
+                if deleted_count > 0:
+                    st.cache_data.clear()
+                    st.success(f"Successfully deleted {deleted_count} record(s)")
+                    st.rerun()
+                else:
+                    st.error("Failed to delete records.")
+    
+    # Quick delete by ID
+    st.markdown("---")
+    st.write("**Quick Delete by ID:**")
+    delete_id = st.number_input(
+        f"Enter record ID to delete from {folder_name}:",
+        min_value=1,
+        key=f"quick_delete_{model_prefix}_{folder_name}"
+    )
+    if st.button("Delete", key=f"quick_delete_btn_{model_prefix}_{folder_name}"):
+        # Only deletes the record if it belongs to this folder
+        if db.delete_chiller_in_folder(delete_id, model_prefix, folder_name):
+            st.cache_data.clear()
+            st.success(f"Record ID {delete_id} deleted successfully")
+            st.rerun()
+        else:
+            st.error(f"Record ID {delete_id} does not belong to this folder.")
 
 if __name__ == "__main__":
     main()
@@ -1,70 +1,202 @@
 import sqlite3
 import json
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 from contextlib import contextmanager
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+# Per-connection settings; journal_mode=WAL is persistent and set once in init_database
+CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-64000',
+    'PRAGMA mmap_size=268435456',
+)
+
+# One long-lived connection per thread, so callers on different threads (Streamlit
+# sessions, the CLI) never wait on each other; WAL lets their reads run alongside a write
+_local = threading.local()
+
+def _connect() -> sqlite3.Connection:
+    """Open and configure a database connection for the current thread."""
+    # A larger statement cache keeps every query below prepared on the long-lived connection
+    conn = sqlite3.connect('chillers.db', cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
 
 @contextmanager
 def get_db_connection():
-    """Context manager for database connections."""
-    conn = sqlite3.connect('chillers.db')
-    conn.row_factory = sqlite3.Row
+    """
+    Context manager for the current thread's database connection.
+    Changes not committed by the time the outermost block exits are rolled back.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = _local.conn = _connect()
+        _local.depth = 0
+    _local.depth += 1
     try:
         yield conn
     finally:
-        conn.close()
+        _local.depth -= 1
+        if _local.depth == 0 and conn.in_transaction:
+            conn.rollback()
+
+# Insertable chillers columns, in table order; batch inserts always bind all of them
+CHILLER_COLUMNS = (
+    'manufacturer', 'model', 'capacity_tons', 'ambient_f', 'ewt_c', 'lwt_c',
+    'efficiency_kw_per_ton', 'iplv_kw_per_ton', 'waterflow_usgpm', 'unit_kw',
+    'compressor_kw', 'fan_kw', 'pressure_drop_psi', 'pressure_drop_ftwg', 'mca_amps',
+    'length_in', 'width_in', 'height_in', 'refrigerant', 'notes', 'extras_json',
+    'folder_name', 'model_prefix'
+)
+# Columns returned by searches: everything except the serialized extras_json blob,
+# which the selector never reads
+SEARCH_COLUMNS = ('id',) + tuple(col for col in CHILLER_COLUMNS if col != 'extras_json') + ('created_at',)
+_SEARCH_SQL = f'''
+    SELECT {', '.join(SEARCH_COLUMNS)} FROM chillers 
+    WHERE capacity_tons >= ? 
+    AND capacity_tons <= ?
+'''
+_BATCH_INSERT_SQL = (f'INSERT INTO chillers ({", ".join(CHILLER_COLUMNS)}) '
+                     f'VALUES ({", ".join("?" * len(CHILLER_COLUMNS))})')
+
+def _dumps_extras(extras: Dict[str, Any]) -> str:
+    """Serialize an extras_json dict to a compact JSON string."""
+    if orjson is not None:
+        return orjson.dumps(extras, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(extras, separators=(',', ':'))
+
+def _tuple_cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+    """Cursor returning plain tuples, for reads that build their own dicts with _to_dicts."""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor
+
+def _to_dicts(cursor: sqlite3.Cursor, rows: List[tuple]) -> List[Dict[str, Any]]:
+    """Zip plain tuple rows with the cursor's column names, skipping sqlite3.Row objects."""
+    columns = [d[0] for d in cursor.description]
+    return [dict(zip(columns, row)) for row in rows]
+
+# Rows fetched at a time by the iter_* generators
+FETCH_CHUNK_SIZE = 1000
+
+def _iter_chiller_rows(query: str, params: tuple = (), chunk_size: int = FETCH_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the rows of a query as dicts, fetching chunk_size rows at a time.
+    The thread's connection stays in use until the generator is exhausted or closed.
+    """
+    with get_db_connection() as conn:
+        cursor = _tuple_cursor(conn)
+        cursor.execute(query, params)
+        for rows in iter(lambda: cursor.fetchmany(chunk_size), []):
+            yield from _to_dicts(cursor, rows)
+
+# Per-folder aggregates of chillers, as read by get_all_folders
+_FOLDER_STATS_SELECT = '''
+    SELECT model_prefix, folder_name, manufacturer,
+           COUNT(*), MIN(ambient_f), MIN(ewt_c), MIN(lwt_c)
+    FROM chillers 
+    WHERE model_prefix IS NOT NULL AND folder_name IS NOT NULL {}
+    GROUP BY model_prefix, folder_name, manufacturer
+'''
+
+_REFRESH_FOLDER_STATS_SQL = 'INSERT INTO folder_stats ' + _FOLDER_STATS_SELECT.format(
+    'AND model_prefix = ? AND folder_name = ?')
+
+def _refresh_folder_stats(cursor: sqlite3.Cursor, folders) -> None:
+    """Recompute the folder_stats rows of the given (model_prefix, folder_name) pairs."""
+    for model_prefix, folder_name in set(map(tuple, folders)):
+        if model_prefix is None or folder_name is None:
+            continue
+        cursor.execute('DELETE FROM folder_stats WHERE model_prefix = ? AND folder_name = ?',
+                       (model_prefix, folder_name))
+        cursor.execute(_REFRESH_FOLDER_STATS_SQL, (model_prefix, folder_name))
+
+# Columns added after the first release, created on older databases by init_database.
+# SQLite cannot add a column with a non-constant default, so created_at has none there.
+MIGRATED_COLUMNS = (
+    ('folder_name', 'TEXT'),
+    ('created_at', 'TIMESTAMP'),
+    ('model_prefix', 'TEXT'),
+)
+
+_SCHEMA_SQL = '''
+    CREATE TABLE IF NOT EXISTS chillers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        manufacturer TEXT,
+        model TEXT NOT NULL,
+        capacity_tons REAL,
+        ambient_f INTEGER,
+        ewt_c REAL,
+        lwt_c REAL,
+        efficiency_kw_per_ton REAL,
+        iplv_kw_per_ton REAL,
+        waterflow_usgpm REAL,
+        unit_kw REAL,
+        compressor_kw REAL,
+        fan_kw REAL,
+        pressure_drop_psi REAL,
+        pressure_drop_ftwg REAL,
+        mca_amps REAL,
+        length_in REAL,
+        width_in REAL,
+        height_in REAL,
+        refrigerant TEXT,
+        notes TEXT,
+        extras_json TEXT,
+        folder_name TEXT,
+        model_prefix TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    {migrations}
+    -- Indexes for the folder, search and manufacturer lookups
+    CREATE INDEX IF NOT EXISTS idx_prefix_folder ON chillers(model_prefix, folder_name);
+    CREATE INDEX IF NOT EXISTS idx_ambient_capacity ON chillers(ambient_f, capacity_tons);
+    CREATE INDEX IF NOT EXISTS idx_manufacturer ON chillers(manufacturer);
+    
+    -- Folder aggregates, kept up to date by the write helpers below and rebuilt
+    -- here in case the database was changed by anything else
+    CREATE TABLE IF NOT EXISTS folder_stats (
+        model_prefix TEXT NOT NULL,
+        folder_name TEXT NOT NULL,
+        manufacturer TEXT,
+        count INTEGER NOT NULL,
+        ambient_f INTEGER,
+        ewt_c REAL,
+        lwt_c REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_folder_stats ON folder_stats(model_prefix, folder_name);
+    DELETE FROM folder_stats;
+    INSERT INTO folder_stats {folder_stats};
+    
+    ANALYZE;
+'''
 
 def init_database():
-    """Initialize the database with the chillers table."""
+    """Initialize the database with the chillers table, migrating older databases in one transaction."""
     with get_db_connection() as conn:
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS chillers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                manufacturer TEXT,
-                model TEXT NOT NULL,
-                capacity_tons REAL,
-                ambient_f INTEGER,
-                ewt_c REAL,
-                lwt_c REAL,
-                efficiency_kw_per_ton REAL,
-                iplv_kw_per_ton REAL,
-                waterflow_usgpm REAL,
-                unit_kw REAL,
-                compressor_kw REAL,
-                fan_kw REAL,
-                pressure_drop_psi REAL,
-                pressure_drop_ftwg REAL,
-                mca_amps REAL,
-                length_in REAL,
-                width_in REAL,
-                height_in REAL,
-                refrigerant TEXT,
-                notes TEXT,
-                extras_json TEXT,
-                folder_name TEXT,
-                model_prefix TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        # WAL lets readers run alongside a writer and makes commits cheaper
+        conn.execute('PRAGMA journal_mode=WAL')
         
         # Add new columns if they don't exist (for existing databases)
-        try:
-            cursor.execute('ALTER TABLE chillers ADD COLUMN folder_name TEXT')
-        except:
-            pass  # Column already exists
+        existing = {row[1] for row in conn.execute('PRAGMA table_info(chillers)')}
+        migrations = ''.join(
+            f'ALTER TABLE chillers ADD COLUMN {column} {column_type};\n'
+            for column, column_type in MIGRATED_COLUMNS
+            if existing and column not in existing
+        )
         
-        try:
-            cursor.execute('ALTER TABLE chillers ADD COLUMN created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP')
-        except:
-            pass  # Column already exists
-        
-        try:
-            cursor.execute('ALTER TABLE chillers ADD COLUMN model_prefix TEXT')
-        except:
-            pass  # Column already exists
-        
-        conn.commit()
+        conn.executescript('BEGIN;\n' + _SCHEMA_SQL.format(
+            migrations=migrations, folder_stats=_FOLDER_STATS_SELECT.format('')
+        ) + 'COMMIT;')
 
 def insert_chiller(chiller_data: Dict[str, Any]) -> int:
     """Insert a single chiller record and return the ID."""
@@ -73,7 +205,7 @@ def insert_chiller(chiller_data: Dict[str, Any]) -> int:
         
         # Convert extras_json dict to string if it exists
         if 'extras_json' in chiller_data and isinstance(chiller_data['extras_json'], dict):
-            chiller_data['extras_json'] = json.dumps(chiller_data['extras_json'])
+            chiller_data['extras_json'] = _dumps_extras(chiller_data['extras_json'])
         
         columns = list(chiller_data.keys())
         placeholders = ', '.join(['?' for _ in columns])
@@ -83,51 +215,77 @@ def insert_chiller(chiller_data: Dict[str, Any]) -> int:
             INSERT INTO chillers ({', '.join(columns)})
             VALUES ({placeholders})
         ''', values)
+        chiller_id = cursor.lastrowid
+        _refresh_folder_stats(cursor, [(chiller_data.get('model_prefix'), chiller_data.get('folder_name'))])
         
         conn.commit()
-        return cursor.lastrowid
+        return chiller_id
 
-def batch_insert_chillers(chillers_data: List[Dict[str, Any]]) -> List[int]:
-    """Insert multiple chiller records and return their IDs."""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        ids = []
-        
-        for chiller_data in chillers_data:
-            # Convert extras_json dict to string if it exists
-            if 'extras_json' in chiller_data and isinstance(chiller_data['extras_json'], dict):
-                chiller_data['extras_json'] = json.dumps(chiller_data['extras_json'])
-            
-            columns = list(chiller_data.keys())
-            placeholders = ', '.join(['?' for _ in columns])
-            values = [chiller_data[col] for col in columns]
-            
-            cursor.execute(f'''
-                INSERT INTO chillers ({', '.join(columns)})
-                VALUES ({placeholders})
-            ''', values)
-            ids.append(cursor.lastrowid)
-        
-        conn.commit()
-        return ids
+def batch_insert_chillers(chillers_df: pd.DataFrame,
+                          conn: Optional[sqlite3.Connection] = None) -> List[int]:
+    """
+    Insert a DataFrame of chiller records in a single transaction and return their IDs.
+    Columns missing from the frame are stored as NULL; columns outside
+    CHILLER_COLUMNS are ignored. If a connection is given, the caller is
+    responsible for committing.
+    """
+    if conn is None:
+        with get_db_connection() as conn:
+            ids = batch_insert_chillers(chillers_df, conn)
+            conn.commit()
+            return ids
+    
+    if chillers_df.empty:
+        return []
+    
+    # Convert each column to native Python values once; rows are zipped from the columns.
+    # Binding the same fixed column list every time keeps one prepared INSERT statement.
+    missing = [None] * len(chillers_df)
+    column_values = []
+    for col in CHILLER_COLUMNS:
+        if col not in chillers_df.columns:
+            column_values.append(missing)
+            continue
+        series = chillers_df[col]
+        if col == 'extras_json':
+            # Convert extras_json dicts to strings
+            column_values.append([_dumps_extras(v) if isinstance(v, dict) else v for v in series])
+        elif series.dtype.kind in 'biuf':
+            column_values.append(series.tolist())
+        else:
+            column_values.append(series.astype(object).where(series.notna(), None).tolist())
+    
+    cursor = conn.cursor()
+    cursor.executemany(_BATCH_INSERT_SQL, zip(*column_values))
+    
+    # Rows inserted within one transaction get consecutive AUTOINCREMENT IDs
+    last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+    
+    prefix_values = column_values[CHILLER_COLUMNS.index('model_prefix')]
+    folder_values = column_values[CHILLER_COLUMNS.index('folder_name')]
+    _refresh_folder_stats(cursor, zip(prefix_values, folder_values))
+    
+    return list(range(last_id - len(chillers_df) + 1, last_id + 1))
 
-def get_chillers_by_criteria(capacity_tons: float, ambient_f: int, 
+def get_chillers_by_criteria(capacity_tons: float, ambient_f: Optional[int], 
                            ewt_c: Optional[float] = None, lwt_c: Optional[float] = None,
                            capacity_tolerance: float = 0.1) -> List[Dict[str, Any]]:
-    """Get chillers matching the specified criteria."""
+    """
+    Get chillers matching the specified criteria. An ambient_f of None matches all ambients.
+    Records carry SEARCH_COLUMNS only; extras_json is left out.
+    """
     with get_db_connection() as conn:
-        cursor = conn.cursor()
+        cursor = _tuple_cursor(conn)
         
         cap_min = capacity_tons * (1 - capacity_tolerance)
         cap_max = capacity_tons * (1 + capacity_tolerance)
         
-        query = '''
-            SELECT * FROM chillers 
-            WHERE ambient_f = ? 
-            AND capacity_tons >= ? 
-            AND capacity_tons <= ?
-        '''
-        params = [ambient_f, cap_min, cap_max]
+        query = _SEARCH_SQL
+        params = [cap_min, cap_max]
+        
+        if ambient_f is not None:
+            query += ' AND ambient_f = ?'
+            params.append(ambient_f)
         
         # Add EWT and LWT filters if provided
         if ewt_c is not None:
@@ -142,7 +300,7 @@ def get_chillers_by_criteria(capacity_tons: float, ambient_f: int,
         rows = cursor.fetchall()
         
         # Convert to list of dictionaries
-        return [dict(row) for row in rows]
+        return _to_dicts(cursor, rows)
 
 def get_available_ambients() -> List[int]:
     """Get list of available ambient temperatures in the database."""
@@ -151,6 +309,22 @@ def get_available_ambients() -> List[int]:
         cursor.execute('SELECT DISTINCT ambient_f FROM chillers WHERE ambient_f IS NOT NULL ORDER BY ambient_f')
         return [row[0] for row in cursor.fetchall()]
 
+def get_ambient_counts(capacity_tons: float = 1, capacity_tolerance: float = 1.0) -> Dict[int, int]:
+    """
+    Count chillers within the capacity range at each available ambient temperature.
+    Every ambient in the database is included, in ascending order, even if its count is 0.
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT ambient_f, SUM(capacity_tons >= ? AND capacity_tons <= ?)
+            FROM chillers
+            WHERE ambient_f IS NOT NULL
+            GROUP BY ambient_f
+            ORDER BY ambient_f
+        ''', (capacity_tons * (1 - capacity_tolerance), capacity_tons * (1 + capacity_tolerance)))
+        return {ambient: count or 0 for ambient, count in cursor.fetchall()}
+
 def get_chiller_by_id(chiller_id: int) -> Optional[Dict[str, Any]]:
     """Get a single chiller by ID."""
     with get_db_connection() as conn:
@@ -159,20 +333,60 @@ def get_chiller_by_id(chiller_id: int) -> Optional[Dict[str, Any]]:
         row = cursor.fetchone()
         return dict(row) if row else None
 
+def iter_all_chillers(chunk_size: int = FETCH_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Iterate over all chillers in the database without loading them all at once."""
+    return _iter_chiller_rows('SELECT * FROM chillers ORDER BY model', (), chunk_size)
+
 def get_all_chillers() -> List[Dict[str, Any]]:
     """Get all chillers in the database."""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM chillers ORDER BY model')
-        return [dict(row) for row in cursor.fetchall()]
+    return list(iter_all_chillers())
 
 def delete_chiller(chiller_id: int) -> bool:
     """Delete a chiller by ID."""
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute('DELETE FROM chillers WHERE id = ?', (chiller_id,))
+        cursor.execute('DELETE FROM chillers WHERE id = ? RETURNING model_prefix, folder_name', (chiller_id,))
+        deleted = cursor.fetchall()
+        _refresh_folder_stats(cursor, deleted)
+        conn.commit()
+        return len(deleted) > 0
+
+def delete_chiller_in_folder(chiller_id: int, model_prefix: str, folder_name: str) -> bool:
+    """Delete a chiller by ID, only if it belongs to the given folder."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            DELETE FROM chillers 
+            WHERE id = ? AND model_prefix = ? AND folder_name = ?
+        ''', (chiller_id, model_prefix, folder_name))
+        deleted = cursor.rowcount > 0
+        if deleted:
+            _refresh_folder_stats(cursor, [(model_prefix, folder_name)])
         conn.commit()
-        return cursor.rowcount > 0
+        return deleted
+
+# Maximum number of IDs bound in one DELETE, under SQLite's default variable limit
+DELETE_CHUNK_SIZE = 900
+
+def delete_chillers_in_folder(chiller_ids: List[int], model_prefix: str, folder_name: str) -> int:
+    """
+    Delete several chillers by ID in one transaction, only those that belong to the given folder.
+    Returns count of deleted records.
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        deleted = 0
+        for start in range(0, len(chiller_ids), DELETE_CHUNK_SIZE):
+            chunk = chiller_ids[start:start + DELETE_CHUNK_SIZE]
+            cursor.execute(f'''
+                DELETE FROM chillers 
+                WHERE id IN ({", ".join("?" * len(chunk))}) AND model_prefix = ? AND folder_name = ?
+            ''', (*chunk, model_prefix, folder_name))
+            deleted += cursor.rowcount
+        if deleted:
+            _refresh_folder_stats(cursor, [(model_prefix, folder_name)])
+        conn.commit()
+        return deleted
 
 def get_database_stats() -> Dict[str, Any]:
     """Get database statistics."""
@@ -194,8 +408,15 @@ def get_database_stats() -> Dict[str, Any]:
             'ambients': ambients
         }
 
+# Distinct model names listed per folder by get_organized_data; one more than
+# the pages show, so they can tell whether the list was cut short
+ORGANIZED_MODELS_LIMIT = 11
+
 def get_organized_data() -> Dict[str, Any]:
-    """Get data organized by model_prefix and folder."""
+    """
+    Get data organized by model_prefix and folder.
+    Each folder lists at most ORGANIZED_MODELS_LIMIT distinct models, in the order they were first imported.
+    """
     with get_db_connection() as conn:
         cursor = conn.cursor()
         
@@ -203,12 +424,19 @@ def get_organized_data() -> Dict[str, Any]:
         cursor.execute('''
             SELECT model_prefix, folder_name, manufacturer,
                    COUNT(*) as count,
-                   GROUP_CONCAT(DISTINCT model) as models
-            FROM chillers 
+                   (SELECT json_group_array(model) FROM (
+                        SELECT model FROM chillers AS m
+                        WHERE m.model_prefix = c.model_prefix AND m.folder_name = c.folder_name
+                          AND m.manufacturer IS c.manufacturer
+                        GROUP BY model
+                        ORDER BY MIN(m.id)
+                        LIMIT ?
+                   )) as models
+            FROM chillers AS c
             WHERE model_prefix IS NOT NULL AND folder_name IS NOT NULL
             GROUP BY model_prefix, folder_name, manufacturer
             ORDER BY model_prefix, folder_name
-        ''')
+        ''', (ORGANIZED_MODELS_LIMIT,))
         
         rows = cursor.fetchall()
         
@@ -222,38 +450,57 @@ def get_organized_data() -> Dict[str, Any]:
                 }
             organized[model_prefix]['folders'][folder_name] = {
                 'count': count,
-                'models': models.split(',') if models else []
+                'models': json.loads(models)
             }
         
         return organized
 
+def iter_chillers_by_folder(model_prefix: str, folder_name: str,
+                            chunk_size: int = FETCH_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Iterate over the chillers of a specific model prefix and folder."""
+    return _iter_chiller_rows('''
+        SELECT * FROM chillers 
+        WHERE model_prefix = ? AND folder_name = ?
+        ORDER BY model
+    ''', (model_prefix, folder_name), chunk_size)
+
 def get_chillers_by_folder(model_prefix: str, folder_name: str) -> List[Dict[str, Any]]:
     """Get chillers from a specific model prefix and folder."""
+    return list(iter_chillers_by_folder(model_prefix, folder_name))
+
+# Columns shown in the per-folder record tables
+FOLDER_DISPLAY_COLUMNS = ('id', 'model', 'capacity_tons', 'efficiency_kw_per_ton', 'waterflow_usgpm')
+
+_FOLDER_DISPLAY_SQL = f'''
+    SELECT model_prefix, folder_name, {', '.join(FOLDER_DISPLAY_COLUMNS)} FROM chillers 
+    WHERE model_prefix IS NOT NULL AND folder_name IS NOT NULL
+    ORDER BY model_prefix, folder_name, model
+'''
+
+def get_folder_display_dfs() -> Dict[Tuple[str, str], pd.DataFrame]:
+    """
+    Get the display columns of every folder's chillers in one query, as DataFrames
+    ordered by model and keyed by (model_prefix, folder_name).
+    Columns are Arrow-backed, so st.dataframe can send them without converting.
+    """
     with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT * FROM chillers 
-            WHERE model_prefix = ? AND folder_name = ?
-            ORDER BY model
-        ''', (model_prefix, folder_name))
-        return [dict(row) for row in cursor.fetchall()]
+        df = pd.read_sql_query(_FOLDER_DISPLAY_SQL, conn, dtype_backend='pyarrow')
+    return {
+        (model_prefix, folder_name): folder_df[list(FOLDER_DISPLAY_COLUMNS)].reset_index(drop=True)
+        for (model_prefix, folder_name), folder_df in df.groupby(['model_prefix', 'folder_name'], sort=False)
+    }
 
 def get_all_folders() -> List[Dict[str, Any]]:
     """Get all folders with their details."""
     with get_db_connection() as conn:
-        cursor = conn.cursor()
+        cursor = _tuple_cursor(conn)
+        # Read from the maintained aggregate table rather than grouping all chillers
         cursor.execute('''
-            SELECT model_prefix, folder_name, manufacturer,
-                   COUNT(*) as count,
-                   MIN(ambient_f) as ambient_f,
-                   MIN(ewt_c) as ewt_c,
-                   MIN(lwt_c) as lwt_c
-            FROM chillers 
-            WHERE model_prefix IS NOT NULL AND folder_name IS NOT NULL
-            GROUP BY model_prefix, folder_name, manufacturer
+            SELECT model_prefix, folder_name, manufacturer, count, ambient_f, ewt_c, lwt_c
+            FROM folder_stats 
             ORDER BY model_prefix, folder_name
         ''')
-        return [dict(row) for row in cursor.fetchall()]
+        return _to_dicts(cursor, cursor.fetchall())
 
 def update_folder_name(model_prefix: str, old_folder_name: str, new_folder_name: str) -> bool:
     """Update folder name for all records in a folder."""
@@ -264,8 +511,11 @@ def update_folder_name(model_prefix: str, old_folder_name: str, new_folder_name:
             SET folder_name = ?
             WHERE model_prefix = ? AND folder_name = ?
         ''', (new_folder_name, model_prefix, old_folder_name))
+        updated = cursor.rowcount > 0
+        if updated:
+            _refresh_folder_stats(cursor, [(model_prefix, old_folder_name), (model_prefix, new_folder_name)])
         conn.commit()
-        return cursor.rowcount > 0
+        return updated
 
 def delete_folder(model_prefix: str, folder_name: str) -> int:
     """Delete all records in a folder. Returns count of deleted records."""
@@ -275,16 +525,20 @@ def delete_folder(model_prefix: str, folder_name: str) -> int:
             DELETE FROM chillers 
             WHERE model_prefix = ? AND folder_name = ?
         ''', (model_prefix, folder_name))
+        deleted_count = cursor.rowcount
+        _refresh_folder_stats(cursor, [(model_prefix, folder_name)])
         conn.commit()
-        return cursor.rowcount
+        return deleted_count
+
+def iter_chillers_by_manufacturer(manufacturer: str,
+                                  chunk_size: int = FETCH_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Iterate over all chillers for a specific manufacturer."""
+    return _iter_chiller_rows('''
+        SELECT * FROM chillers 
+        WHERE manufacturer = ?
+        ORDER BY folder_name, model
+    ''', (manufacturer,), chunk_size)
 
 def get_chillers_by_manufacturer(manufacturer: str) -> List[Dict[str, Any]]:
     """Get all chillers for a specific manufacturer."""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT * FROM chillers 
-            WHERE manufacturer = ?
-            ORDER BY folder_name, model
-        ''', (manufacturer,))
-        return [dict(row) for row in cursor.fetchall()]
+    return list(iter_chillers_by_manufacturer(manufacturer))
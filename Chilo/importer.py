@@ -1,24 +1,59 @@
 import pandas as pd
+import numpy as np
 import re
-from typing import List, Dict, Any, Tuple, Optional
-from io import StringIO
+from typing import List, Any, Tuple, Optional, Callable
+from io import StringIO, BytesIO
+from collections import Counter
 import streamlit as st
-from utils import (
-    parse_dimensions, parse_pressure_drop, safe_float, safe_int, 
-    normalize_header, clean_model_name, validate_chiller_data
-)
+from utils import normalize_header, validate_chiller_dataframe, extract_model_prefixes, TEXT_FIELDS
+from db import batch_insert_chillers, get_db_connection
+
+# Map normalized headers to database fields
+COLUMN_MAPPING = {
+    'model': 'model',
+    'tons': 'capacity_tons',
+    'efficiency_kw_per_ton': 'efficiency_kw_per_ton',
+    'iplv_kw_per_ton': 'iplv_kw_per_ton',
+    'waterflow_usgpm': 'waterflow_usgpm',
+    'unit_kw': 'unit_kw',
+    'compressor_kw': 'compressor_kw',
+    'fan_kw': 'fan_kw',
+    'pressure_drop': 'pressure_drop',
+    'mca_amps': 'mca_amps',
+    'dimensions': 'dimensions'
+}
+
+# Columns stored in their own database fields (everything else goes to extras_json)
+MAPPED_COLUMNS = frozenset({
+    'model', 'manufacturer', 'capacity_tons', 'efficiency_kw_per_ton', 'iplv_kw_per_ton',
+    'waterflow_usgpm', 'unit_kw', 'compressor_kw', 'fan_kw',
+    'pressure_drop_psi', 'pressure_drop_ftwg', 'mca_amps',
+    'length_in', 'width_in', 'height_in', 'ambient_f', 'ewt_c', 'lwt_c',
+    'folder_name', 'model_prefix'
+})
+
+# Number of rows read, validated and inserted at a time by import_from_file
+IMPORT_CHUNK_SIZE = 10_000
+
+# Cell values treated as missing, in addition to pandas' defaults ('', 'N/A', 'NaN', ...)
+NA_VALUES = ['-', '—']
+
+# Runs of 2+ whitespace characters within a line
+_MULTI_SPACE_RE = re.compile(r'[^\S\n]{2,}')
+# Dimensions like "152.0 L 89.0 W 89.0 H (in)"
+_DIM_RE = re.compile(r'([0-9.]+)\s*L\s*([0-9.]+)\s*W\s*([0-9.]+)\s*H')
+# Pressure drop like "3.4/7.7" (psi/ft.w.g)
+_PRESSURE_RE = re.compile(r'^([^/]*)/([^/]*)$')
 
 def detect_delimiter(text: str) -> str:
     """Detect the delimiter used in the table (tab, comma, or multiple spaces)."""
-    lines = text.strip().split('\n')
-    if not lines:
-        return '\t'
-    
-    # Count occurrences of different delimiters in the first few lines
-    sample_lines = lines[:3]
-    tab_count = sum(line.count('\t') for line in sample_lines)
-    comma_count = sum(line.count(',') for line in sample_lines)
-    space_count = sum(len(re.findall(r'\s{2,}', line)) for line in sample_lines)
+    # Count occurrences of different delimiters in the first few lines only
+    sample = '\n'.join(text.strip().split('\n', 3)[:3])
+    char_counts = Counter(sample)
+    tab_count = char_counts['\t']
+    comma_count = char_counts[',']
+    # Runs of 2+ whitespace characters that do not cross a line break
+    space_count = len(_MULTI_SPACE_RE.findall(sample))
     
     if tab_count > comma_count and tab_count > space_count:
         return '\t'
@@ -27,6 +62,10 @@ def detect_delimiter(text: str) -> str:
     else:
         return r'\s{2,}'  # Multiple spaces
 
+def _format_row_errors(row_errors: List[Tuple[Any, str]]) -> List[str]:
+    """Format (row_index, message) pairs from validation as user-facing messages."""
+    return [f"Row {idx + 1}: {error}" for idx, error in row_errors]
+
 def parse_table_text(text: str, ambient_f: Optional[int] = None, 
                     ewt_c: Optional[float] = None, lwt_c: Optional[float] = None) -> Tuple[pd.DataFrame, List[str]]:
     """
@@ -38,16 +77,21 @@ def parse_table_text(text: str, ambient_f: Optional[int] = None,
     if not text.strip():
         return pd.DataFrame(), ["No data provided"]
     
+    # A table needs a header line and at least one data line
+    if '\n' not in text.strip():
+        return pd.DataFrame(), ["No data could be parsed from the input"]
+    
     # Detect delimiter
     delimiter = detect_delimiter(text)
+    buffer = StringIO(text)
     
     try:
         # Read the table
         if delimiter == r'\s{2,}':
             # For multiple spaces, use a more flexible approach
-            df = pd.read_csv(StringIO(text), sep=r'\s+', engine='python')
+            df = pd.read_csv(buffer, sep=r'\s+', engine='c', na_values=NA_VALUES)
         else:
-            df = pd.read_csv(StringIO(text), sep=delimiter, engine='python')
+            df = pd.read_csv(buffer, sep=delimiter, engine='c', na_values=NA_VALUES)
         
         if df.empty:
             return df, ["No data could be parsed from the input"]
@@ -56,32 +100,11 @@ def parse_table_text(text: str, ambient_f: Optional[int] = None,
         original_columns = list(df.columns)
         normalized_columns = [normalize_header(col) for col in df.columns]
         
-        # Map known columns to database fields
-        column_mapping = {
-            'model': 'model',
-            'tons': 'capacity_tons',
-            'efficiency_kw_per_ton': 'efficiency_kw_per_ton',
-            'iplv_kw_per_ton': 'iplv_kw_per_ton',
-            'waterflow_usgpm': 'waterflow_usgpm',
-            'unit_kw': 'unit_kw',
-            'compressor_kw': 'compressor_kw',
-            'fan_kw': 'fan_kw',
-            'pressure_drop': 'pressure_drop',
-            'mca_amps': 'mca_amps',
-            'dimensions': 'dimensions'
-        }
-        
-        # Create new column names, preserving original order
-        new_columns = []
-        for i, col in enumerate(normalized_columns):
-            if col in column_mapping:
-                new_columns.append(column_mapping[col])
-            else:
-                # Keep original column name for unmapped columns
-                new_columns.append(original_columns[i])
-        
-        # Apply the new column names
-        df.columns = new_columns
+        # Map known columns to database fields, keeping original names for unmapped columns
+        df.columns = [
+            COLUMN_MAPPING.get(normalized, original)
+            for normalized, original in zip(normalized_columns, original_columns)
+        ]
         
         # Add batch-assigned values
         if ambient_f is not None:
@@ -91,9 +114,6 @@ def parse_table_text(text: str, ambient_f: Optional[int] = None,
         if lwt_c is not None:
             df['lwt_c'] = lwt_c
         
-        # Extract model prefix for each row and generate folder name
-        from utils import extract_model_prefix
-        
         # Generate folder name based on ambient and temperatures (used as subfolder)
         if ambient_f is not None and ewt_c is not None and lwt_c is not None:
             df['folder_name'] = f"{ambient_f}°F {ewt_c}°C/{lwt_c}°C"
@@ -104,7 +124,7 @@ def parse_table_text(text: str, ambient_f: Optional[int] = None,
         
         # Extract model prefix for each row
         if 'model' in df.columns:
-            df['model_prefix'] = df['model'].apply(lambda x: extract_model_prefix(str(x)) if pd.notna(x) else None)
+            df['model_prefix'] = extract_model_prefixes(df['model'])
         else:
             df['model_prefix'] = None
         
@@ -113,35 +133,17 @@ def parse_table_text(text: str, ambient_f: Optional[int] = None,
         
         # Ensure model column is first if it exists (after all processing)
         if 'model' in df.columns:
-            # Get all columns except model
-            other_columns = [col for col in df.columns if col != 'model']
-            # Reorder with model first
-            df = df[['model'] + other_columns]
+            df.insert(0, 'model', df.pop('model'))
         
-        # Clean and validate data
-        validated_rows = []
-        for idx, row in df.iterrows():
-            row_dict = row.to_dict()
-            cleaned_data, row_errors = validate_chiller_data(row_dict)
-            if row_errors:
-                errors.extend([f"Row {idx + 1}: {error}" for error in row_errors])
-            validated_rows.append(cleaned_data)
+        # Clean and validate data in place
+        df, row_errors = validate_chiller_dataframe(df)
+        errors.extend(_format_row_errors(row_errors))
         
-        # Convert back to DataFrame
-        if validated_rows:
-            result_df = pd.DataFrame(validated_rows)
-            
-            # Preserve the column order from the original DataFrame
-            if not df.empty:
-                # Get the column order from the original DataFrame
-                original_order = list(df.columns)
-                # Reorder the result DataFrame to match
-                available_columns = [col for col in original_order if col in result_df.columns]
-                result_df = result_df[available_columns]
-        else:
-            result_df = pd.DataFrame()
+        # Unmapped columns are not carried over from pasted tables
+        if 'extras_json' in df.columns:
+            del df['extras_json']
         
-        return result_df, errors
+        return df, errors
         
     except Exception as e:
         errors.append(f"Error parsing table: {str(e)}")
@@ -150,48 +152,28 @@ def parse_table_text(text: str, ambient_f: Optional[int] = None,
 def parse_special_fields(df: pd.DataFrame, errors: List[str]) -> pd.DataFrame:
     """Parse special fields like dimensions and pressure drop."""
     
-    # Parse dimensions
+    # Parse dimensions, e.g. "152.0 L 89.0 W 89.0 H (in)"
     if 'dimensions' in df.columns:
-        dimensions_data = []
-        for idx, dim_str in df['dimensions'].items():
-            if pd.isna(dim_str):
-                dimensions_data.append({'length_in': None, 'width_in': None, 'height_in': None})
-            else:
-                length, width, height = parse_dimensions(str(dim_str))
-                dimensions_data.append({
-                    'length_in': length,
-                    'width_in': width,
-                    'height_in': height
-                })
-        
-        # Add dimension columns
-        dim_df = pd.DataFrame(dimensions_data)
-        for col in ['length_in', 'width_in', 'height_in']:
-            df[col] = dim_df[col]
+        dims = df['dimensions'].astype('string').str.extract(_DIM_RE)
+        dims = dims.apply(pd.to_numeric, errors='coerce')
+        # A dimension string is either parsed completely or not at all
+        dims[dims.isna().any(axis=1)] = np.nan
+        df[['length_in', 'width_in', 'height_in']] = dims.to_numpy(dtype='float64')
     
-    # Parse pressure drop
+    # Parse pressure drop, e.g. "3.4/7.7"
     if 'pressure_drop' in df.columns:
-        pressure_data = []
-        for idx, pressure_str in df['pressure_drop'].items():
-            if pd.isna(pressure_str):
-                pressure_data.append({'pressure_drop_psi': None, 'pressure_drop_ftwg': None})
-            else:
-                psi, ftwg = parse_pressure_drop(str(pressure_str))
-                pressure_data.append({
-                    'pressure_drop_psi': psi,
-                    'pressure_drop_ftwg': ftwg
-                })
-        
-        # Add pressure drop columns
-        pressure_df = pd.DataFrame(pressure_data)
-        for col in ['pressure_drop_psi', 'pressure_drop_ftwg']:
-            df[col] = pressure_df[col]
+        pressure = df['pressure_drop'].astype('string').str.extract(_PRESSURE_RE)
+        pressure = pressure.apply(lambda col: pd.to_numeric(col.str.strip(), errors='coerce'))
+        pressure[pressure.isna().any(axis=1)] = np.nan
+        df[['pressure_drop_psi', 'pressure_drop_ftwg']] = pressure.to_numpy(dtype='float64')
     
     return df
 
-def import_chillers_from_dataframe(df: pd.DataFrame, db_module) -> Tuple[int, List[str]]:
+def import_chillers_from_dataframe(df: pd.DataFrame, db_module, already_validated: bool = True) -> Tuple[int, List[str]]:
     """
     Import chillers from a DataFrame into the database.
+    The DataFrame is expected to come from parse_table_text(), which has already
+    validated it; pass already_validated=False to validate other frames first.
     Returns (number_imported, list_of_errors)
     """
     if df.empty:
@@ -201,32 +183,16 @@ def import_chillers_from_dataframe(df: pd.DataFrame, db_module) -> Tuple[int, Li
     imported_count = 0
     
     try:
-        # Convert DataFrame to list of dictionaries
-        chillers_data = df.to_dict('records')
+        if not already_validated:
+            df, record_errors = validate_chiller_dataframe(df)
+            errors.extend([f"Record validation error: {error}" for _, error in record_errors])
         
-        # Import in batches
-        batch_size = 50
-        for i in range(0, len(chillers_data), batch_size):
-            batch = chillers_data[i:i + batch_size]
-            try:
-                # Clean and validate each record before importing
-                cleaned_batch = []
-                for record in batch:
-                    from utils import validate_chiller_data
-                    cleaned_data, record_errors = validate_chiller_data(record)
-                    if record_errors:
-                        errors.extend([f"Record validation error: {error}" for error in record_errors])
-                    cleaned_batch.append(cleaned_data)
-                
-                if cleaned_batch:
-                    db_module.batch_insert_chillers(cleaned_batch)
-                    imported_count += len(cleaned_batch)
-                else:
-                    errors.append(f"No valid records in batch {i//batch_size + 1}")
-                    
-            except Exception as e:
-                error_msg = f"Error importing batch {i//batch_size + 1}: {str(e)}"
-                errors.append(error_msg)
+        # Import everything in a single transaction
+        try:
+            db_module.batch_insert_chillers(df)
+            imported_count = len(df)
+        except Exception as e:
+            errors.append(f"Error importing records: {str(e)}")
         
         return imported_count, errors
         
@@ -260,23 +226,27 @@ def preview_parsed_data(df: pd.DataFrame) -> None:
     # Show column mapping info
     with st.expander("Column Mapping Details"):
         st.write("**Mapped columns:**")
-        mapped_cols = [col for col in df.columns if col in [
-            'model', 'capacity_tons', 'efficiency_kw_per_ton', 'iplv_kw_per_ton',
-            'waterflow_usgpm', 'unit_kw', 'compressor_kw', 'fan_kw',
-            'pressure_drop_psi', 'pressure_drop_ftwg', 'mca_amps',
-            'length_in', 'width_in', 'height_in', 'ambient_f', 'ewt_c', 'lwt_c'
-        ]]
+        mapped_cols = [col for col in df.columns if col in MAPPED_COLUMNS]
         
+        non_null_counts = df[mapped_cols].notna().sum()
         for col in mapped_cols:
-            st.write(f"- {col}: {df[col].notna().sum()} non-null values")
+            st.write(f"- {col}: {non_null_counts[col]} non-null values")
         
         # Show unmapped columns
-        unmapped = [col for col in df.columns if col not in mapped_cols and not col.startswith('Unnamed')]
+        unmapped = [col for col in df.columns if col not in MAPPED_COLUMNS and not str(col).startswith('Unnamed')]
         if unmapped:
             st.write("**Unmapped columns (will be stored in extras_json):**")
             for col in unmapped:
                 st.write(f"- {col}")
 
+def _delimiter_for_name(file_name: str) -> Optional[str]:
+    """Pick the delimiter from a file name's extension, or None if it has to be detected."""
+    if file_name.endswith('.csv'):
+        return ','
+    elif file_name.endswith('.tsv') or file_name.endswith('.txt'):
+        return '\t'
+    return None
+
 def import_from_file(file_path: str, ambient_f: Optional[int] = None,
                     ewt_c: Optional[float] = None, lwt_c: Optional[float] = None) -> Tuple[int, List[str]]:
     """
@@ -284,72 +254,112 @@ def import_from_file(file_path: str, ambient_f: Optional[int] = None,
     Returns (number_imported, list_of_errors)
     """
     try:
-        # Read the file
-        if file_path.endswith('.csv'):
-            df = pd.read_csv(file_path)
-        elif file_path.endswith('.tsv') or file_path.endswith('.txt'):
-            df = pd.read_csv(file_path, sep='\t')
-        else:
+        # Pick the delimiter
+        delimiter = _delimiter_for_name(file_path)
+        if delimiter is None:
             # Try to detect delimiter
             with open(file_path, 'r') as f:
                 sample = f.read(1024)
             delimiter = detect_delimiter(sample)
-            df = pd.read_csv(file_path, sep=delimiter)
         
-        # Clean column names
-        df.columns = [normalize_header(col) for col in df.columns]
+        return _import_delimited(lambda: file_path, delimiter, ambient_f, ewt_c, lwt_c)
         
-        # Add batch-assigned values
-        if ambient_f is not None:
-            df['ambient_f'] = ambient_f
-        if ewt_c is not None:
-            df['ewt_c'] = ewt_c
-        if lwt_c is not None:
-            df['lwt_c'] = lwt_c
-        
-        # Extract model prefix for each row and generate folder name
-        from utils import extract_model_prefix
-        
-        # Generate folder name based on ambient and temperatures (used as subfolder)
-        if ambient_f is not None and ewt_c is not None and lwt_c is not None:
-            df['folder_name'] = f"{ambient_f}°F {ewt_c}°C/{lwt_c}°C"
-        elif ambient_f is not None:
-            df['folder_name'] = f"{ambient_f}°F"
-        else:
-            df['folder_name'] = "Unknown"
+    except Exception as e:
+        return 0, [f"File reading error: {str(e)}"]
+
+def import_from_buffer(buffer: bytes, ambient_f: Optional[int] = None,
+                      ewt_c: Optional[float] = None, lwt_c: Optional[float] = None,
+                      file_name: str = '') -> Tuple[int, List[str]]:
+    """
+    Import chillers from an in-memory CSV/TSV file (e.g. an upload) without writing it to disk.
+    The delimiter is picked from file_name's extension, or detected from the data.
+    Returns (number_imported, list_of_errors)
+    """
+    try:
+        # Pick the delimiter
+        delimiter = _delimiter_for_name(file_name)
+        if delimiter is None:
+            # Try to detect delimiter
+            delimiter = detect_delimiter(buffer[:1024].decode('utf-8', errors='ignore'))
         
-        # Extract model prefix for each row
-        if 'model' in df.columns:
-            df['model_prefix'] = df['model'].apply(lambda x: extract_model_prefix(str(x)) if pd.notna(x) else None)
-        else:
-            df['model_prefix'] = None
+        return _import_delimited(lambda: BytesIO(buffer), delimiter, ambient_f, ewt_c, lwt_c)
         
-        # Parse special fields
-        errors = []
-        df = parse_special_fields(df, errors)
+    except Exception as e:
+        return 0, [f"File reading error: {str(e)}"]
+
+def _import_delimited(open_source: Callable[[], Any], delimiter: str, ambient_f: Optional[int],
+                      ewt_c: Optional[float], lwt_c: Optional[float]) -> Tuple[int, List[str]]:
+    """
+    Read, validate and insert delimited data in chunks.
+    open_source returns a fresh path or buffer for pd.read_csv each time it is called.
+    """
+    # Only multiple-space tables need the Python engine
+    engine = 'python' if delimiter == r'\s{2,}' else 'c'
+    
+    # Read the header first so text columns can be typed by the parser
+    header = pd.read_csv(open_source(), sep=delimiter, engine=engine, nrows=0).columns
+    fields = [COLUMN_MAPPING.get(normalize_header(col), normalize_header(col)) for col in header]
+    text_dtypes = {col: str for col, field in zip(header, fields) if field in TEXT_FIELDS}
+    
+    # Read the data in chunks so large files never have to fit in memory at once
+    reader = pd.read_csv(open_source(), sep=delimiter, engine=engine, dtype=text_dtypes,
+                         na_values=NA_VALUES, chunksize=IMPORT_CHUNK_SIZE)
+    
+    errors = []
+    row_errors = []
+    imported_count = 0
+    
+    # All chunks share one connection and are committed together
+    with get_db_connection() as conn:
+        for df in reader:
+            # Clean column names
+            df.columns = fields
+            
+            # Add batch-assigned values
+            if ambient_f is not None:
+                df['ambient_f'] = ambient_f
+            if ewt_c is not None:
+                df['ewt_c'] = ewt_c
+            if lwt_c is not None:
+                df['lwt_c'] = lwt_c
+            
+            # Generate folder name based on ambient and temperatures (used as subfolder)
+            if ambient_f is not None and ewt_c is not None and lwt_c is not None:
+                df['folder_name'] = f"{ambient_f}°F {ewt_c}°C/{lwt_c}°C"
+            elif ambient_f is not None:
+                df['folder_name'] = f"{ambient_f}°F"
+            else:
+                df['folder_name'] = "Unknown"
+            
+            # Extract model prefix for each row
+            if 'model' in df.columns:
+                df['model_prefix'] = extract_model_prefixes(df['model'])
+            else:
+                df['model_prefix'] = None
+            
+            # Parse special fields
+            df = parse_special_fields(df, errors)
+            
+            # Clean and validate data in place
+            df, chunk_errors = validate_chiller_dataframe(df)
+            row_errors.extend(chunk_errors)
+            
+            # Import to database
+            try:
+                batch_insert_chillers(df, conn)
+            except Exception as e:
+                return 0, errors + _format_row_errors(row_errors) + [f"Database error: {str(e)}"]
+            imported_count += len(df)
         
-        # Clean and validate data
-        validated_rows = []
-        for idx, row in df.iterrows():
-            row_dict = row.to_dict()
-            cleaned_data, row_errors = validate_chiller_data(row_dict)
-            if row_errors:
-                errors.extend([f"Row {idx + 1}: {error}" for error in row_errors])
-            validated_rows.append(cleaned_data)
+        # Row errors are formatted once, after all chunks are processed
+        errors.extend(_format_row_errors(row_errors))
         
-        if not validated_rows:
+        if imported_count == 0:
             return 0, errors + ["No valid data found"]
         
-        # Convert back to DataFrame and import
-        result_df = pd.DataFrame(validated_rows)
-        
-        # Import to database
-        from db import batch_insert_chillers
         try:
-            batch_insert_chillers(validated_rows)
-            return len(validated_rows), errors
+            conn.commit()
         except Exception as e:
             return 0, errors + [f"Database error: {str(e)}"]
-        
-    except Exception as e:
-        return 0, [f"File reading error: {str(e)}"]
+    
+    return imported_count, errors
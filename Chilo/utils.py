@@ -1,5 +1,78 @@
 import re
-from typing import Dict, Any, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Numeric fields with their display names (used in validation messages)
+NUMERIC_FIELDS = {
+    'capacity_tons': 'Capacity (tons)',
+    'efficiency_kw_per_ton': 'Energy efficiency',
+    'iplv_kw_per_ton': 'IPLV',
+    'waterflow_usgpm': 'Waterflow',
+    'unit_kw': 'Unit kW',
+    'compressor_kw': 'Compressor kW',
+    'fan_kw': 'Fan kW',
+    'mca_amps': 'MCA',
+    'ambient_f': 'Ambient',
+    'ewt_c': 'EWT',
+    'lwt_c': 'LWT'
+}
+REQUIRED_NUMERIC_FIELDS = ['capacity_tons', 'efficiency_kw_per_ton']
+TEXT_FIELDS = ['model', 'manufacturer', 'refrigerant', 'notes', 'folder_name', 'model_prefix']
+
+# Numeric fields derived from the special "dimensions" and "pressure_drop" columns
+DERIVED_FIELDS = ['length_in', 'width_in', 'height_in', 'pressure_drop_psi', 'pressure_drop_ftwg']
+
+# Whole-number fields, downcast to the smallest integer dtype when no values are missing
+INTEGER_FIELDS = ['ambient_f']
+
+# Column dtypes of validated chiller data
+DTYPE_MAP = {
+    **{field: 'float64' for field in NUMERIC_FIELDS},
+    **{field: 'float64' for field in DERIVED_FIELDS},
+    **{field: object for field in TEXT_FIELDS}
+}
+
+# Precompiled patterns
+_DIM_RE = re.compile(r'([0-9.]+)\s*L\s*([0-9.]+)\s*W\s*([0-9.]+)\s*H')
+_PAREN_RE = re.compile(r'\([^)]*\)')
+_WS_RE = re.compile(r'\s+')
+_PREFIX_RE = re.compile(r'^([A-Za-z\-]+)')
+_DECIMAL_RE = re.compile(r'\d+\.?\d*|\.\d+')
+_NUMBER_RE = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+
+# Common header variations, applied after normalization
+_HEADER_VARIATIONS = {
+    'energy efficiency (kw/ton)': 'energy efficiency',
+    'energy efficiency': 'efficiency_kw_per_ton',
+    'efficiency': 'efficiency_kw_per_ton',
+    'iplv (kw/ton)': 'iplv_kw_per_ton',
+    'iplv': 'iplv_kw_per_ton',
+    'usgpm': 'waterflow_usgpm',
+    'waterflow': 'waterflow_usgpm',
+    'u. kw': 'unit_kw',
+    'c. kw': 'compressor_kw',
+    'f. kw': 'fan_kw',
+    'psi/ft.w.g': 'pressure_drop',
+    'mca': 'mca_amps',
+    'dimensions': 'dimensions'
+}
+
+# Common manufacturer model prefixes
+_MFR_PREFIXES = {
+    'ACHX': 'Dunham Bush',
+    'AVX': 'Dunham Bush',
+    'CH': 'Carrier',
+    'TRA': 'Trane',
+    'RT': 'Trane',
+    'YORK': 'York',
+    'YV': 'York',
+    'MC': 'McQuay',
+    'MCH': 'McQuay'
+}
+# Longest prefixes first so that e.g. MCH is tried before MC
+_MFR_RE = re.compile('^(' + '|'.join(sorted(_MFR_PREFIXES, key=len, reverse=True)) + ')', re.IGNORECASE)
 
 def parse_dimensions(dimensions_str: str) -> Tuple[Optional[float], Optional[float], Optional[float]]:
     """
@@ -10,17 +83,11 @@ def parse_dimensions(dimensions_str: str) -> Tuple[Optional[float], Optional[flo
         return None, None, None
     
     # Pattern to match: number L number W number H (in)
-    pattern = r'([0-9.]+)\s*L\s*([0-9.]+)\s*W\s*([0-9.]+)\s*H'
-    match = re.search(pattern, dimensions_str)
+    match = _DIM_RE.search(dimensions_str)
     
-    if match:
-        try:
-            length = float(match.group(1))
-            width = float(match.group(2))
-            height = float(match.group(3))
-            return length, width, height
-        except ValueError:
-            pass
+    # Each group is made of digits and dots; only convert well-formed numbers
+    if match and all(_DECIMAL_RE.fullmatch(group) for group in match.groups()):
+        return float(match.group(1)), float(match.group(2)), float(match.group(3))
     
     return None, None, None
 
@@ -33,19 +100,20 @@ def parse_pressure_drop(psi_ftwg_str: str) -> Tuple[Optional[float], Optional[fl
         return None, None
     
     # Split by "/" and extract numbers
-    parts = psi_ftwg_str.split('/')
-    if len(parts) == 2:
-        try:
-            psi = float(parts[0].strip())
-            ftwg = float(parts[1].strip())
-            return psi, ftwg
-        except ValueError:
-            pass
+    parts = [part.strip() for part in psi_ftwg_str.split('/')]
+    if len(parts) == 2 and all(_NUMBER_RE.fullmatch(part) for part in parts):
+        return float(parts[0]), float(parts[1])
     
     return None, None
 
 def safe_float(value: Any) -> Optional[float]:
     """Safely convert value to float, returning None for empty/invalid values."""
+    # Fast path for values that are already numbers
+    if type(value) is float:
+        return value
+    if type(value) is int:
+        return float(value)
+    
     if value is None or value == '' or value == 'N/A':
         return None
     
@@ -56,6 +124,10 @@ def safe_float(value: Any) -> Optional[float]:
 
 def safe_int(value: Any) -> Optional[int]:
     """Safely convert value to int, returning None for empty/invalid values."""
+    # Fast path for values that are already ints
+    if type(value) is int:
+        return value
+    
     if value is None or value == '' or value == 'N/A':
         return None
     
@@ -64,6 +136,7 @@ def safe_int(value: Any) -> Optional[int]:
     except (ValueError, TypeError):
         return None
 
+@lru_cache(maxsize=1024)
 def normalize_header(header: str) -> str:
     """
     Normalize header text for matching.
@@ -79,29 +152,12 @@ def normalize_header(header: str) -> str:
     normalized = header.lower().strip()
     
     # Remove text in parentheses
-    normalized = re.sub(r'\([^)]*\)', '', normalized)
+    normalized = _PAREN_RE.sub('', normalized)
     
     # Remove extra whitespace
-    normalized = re.sub(r'\s+', ' ', normalized).strip()
-    
-    # Common variations
-    variations = {
-        'energy efficiency (kw/ton)': 'energy efficiency',
-        'energy efficiency': 'efficiency_kw_per_ton',
-        'efficiency': 'efficiency_kw_per_ton',
-        'iplv (kw/ton)': 'iplv_kw_per_ton',
-        'iplv': 'iplv_kw_per_ton',
-        'usgpm': 'waterflow_usgpm',
-        'waterflow': 'waterflow_usgpm',
-        'u. kw': 'unit_kw',
-        'c. kw': 'compressor_kw',
-        'f. kw': 'fan_kw',
-        'psi/ft.w.g': 'pressure_drop',
-        'mca': 'mca_amps',
-        'dimensions': 'dimensions'
-    }
-    
-    return variations.get(normalized, normalized)
+    normalized = _WS_RE.sub(' ', normalized).strip()
+    
+    return _HEADER_VARIATIONS.get(normalized, normalized)
 
 def convert_eer_to_kw_per_ton(eer: float) -> float:
     """Convert EER to kW/ton using the formula: kW/ton = 3.51685 / EER"""
@@ -121,25 +177,8 @@ def extract_manufacturer_from_model(model: str) -> Optional[str]:
     if not model:
         return None
     
-    # Common manufacturer prefixes
-    prefixes = {
-        'ACHX': 'Dunham Bush',
-        'AVX': 'Dunham Bush',
-        'CH': 'Carrier',
-        'TRA': 'Trane',
-        'RT': 'Trane',
-        'YORK': 'York',
-        'YV': 'York',
-        'MC': 'McQuay',
-        'MCH': 'McQuay'
-    }
-    
-    model_upper = model.upper()
-    for prefix, manufacturer in prefixes.items():
-        if model_upper.startswith(prefix):
-            return manufacturer
-    
-    return None
+    match = _MFR_RE.match(model)
+    return _MFR_PREFIXES[match.group(1).upper()] if match else None
 
 def extract_model_prefix(model: str) -> Optional[str]:
     """
@@ -163,13 +202,20 @@ def extract_model_prefix(model: str) -> Optional[str]:
         return first_part
     
     # Otherwise, try to extract prefix before first number
-    import re
-    match = re.match(r'^([A-Za-z\-]+)', model)
+    match = _PREFIX_RE.match(model)
     if match:
         return match.group(1)
     
     return first_part
 
+def extract_model_prefixes(models: pd.Series) -> pd.Series:
+    """
+    Vectorized extract_model_prefix for a Series of model names.
+    The prefix is the first whitespace-separated part of the model name.
+    """
+    prefixes = models.astype('string').str.extract(r'^\s*(\S+)', expand=False)
+    return pd.Series(prefixes.to_numpy(dtype=object, na_value=None), index=models.index)
+
 def validate_chiller_data(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Validate and clean chiller data.
@@ -183,30 +229,15 @@ def validate_chiller_data(data: Dict[str, Any]) -> Dict[str, Any]:
         errors.append("Model is required")
     
     # Clean and validate numeric fields
-    numeric_fields = {
-        'capacity_tons': 'Capacity (tons)',
-        'efficiency_kw_per_ton': 'Energy efficiency',
-        'iplv_kw_per_ton': 'IPLV',
-        'waterflow_usgpm': 'Waterflow',
-        'unit_kw': 'Unit kW',
-        'compressor_kw': 'Compressor kW',
-        'fan_kw': 'Fan kW',
-        'mca_amps': 'MCA',
-        'ambient_f': 'Ambient',
-        'ewt_c': 'EWT',
-        'lwt_c': 'LWT'
-    }
-    
-    for field, display_name in numeric_fields.items():
+    for field, display_name in NUMERIC_FIELDS.items():
         value = safe_float(data.get(field))
         if value is not None:
             cleaned[field] = value
-        elif field in ['capacity_tons', 'efficiency_kw_per_ton']:
+        elif field in REQUIRED_NUMERIC_FIELDS:
             errors.append(f"{display_name} is required")
     
     # Clean text fields
-    text_fields = ['model', 'manufacturer', 'refrigerant', 'notes', 'folder_name', 'model_prefix']
-    for field in text_fields:
+    for field in TEXT_FIELDS:
         value = data.get(field)
         if value:
             cleaned[field] = str(value).strip()
@@ -241,3 +272,62 @@ def validate_chiller_data(data: Dict[str, Any]) -> Dict[str, Any]:
         cleaned['extras_json'] = extras
     
     return cleaned, errors
+
+def validate_chiller_dataframe(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Tuple[Any, str]]]:
+    """
+    Validate and clean a whole DataFrame of chiller data column-wise, in place.
+    Applies the same rules as validate_chiller_data, but expects the special
+    fields (dimensions, pressure drop) to be parsed already. Unmapped columns
+    are packed into extras_json and dropped.
+    Returns (df, errors) where errors is a list of (row_index, message).
+    """
+    # Clean numeric and text fields, keeping the original column order
+    extra_cols = []
+    for col in list(df.columns):
+        if col in INTEGER_FIELDS:
+            df[col] = pd.to_numeric(df[col], errors='coerce', downcast='integer')
+        elif col in NUMERIC_FIELDS or col in DERIVED_FIELDS:
+            df[col] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=DTYPE_MAP[col], na_value=np.nan)
+        elif col in TEXT_FIELDS:
+            values = df[col].astype('string').str.strip().replace('', pd.NA)
+            df[col] = values.to_numpy(dtype=DTYPE_MAP[col], na_value=None)
+        elif col not in ('dimensions', 'pressure_drop'):
+            extra_cols.append(col)
+    
+    # Store any unmapped fields in extras_json
+    if extra_cols:
+        extras = [
+            {k: v for k, v in row.items() if pd.notna(v)} or None
+            for row in df[extra_cols].to_dict('records')
+        ]
+    df.drop(columns=[col for col in df.columns if col in extra_cols or col in ('dimensions', 'pressure_drop')],
+            inplace=True)
+    
+    # Extract manufacturer if not provided
+    if 'model' in df.columns:
+        if 'manufacturer' in df.columns:
+            missing = df['manufacturer'].isna() & df['model'].notna()
+        else:
+            df['manufacturer'] = None
+            missing = df['model'].notna()
+        if missing.any():
+            df.loc[missing, 'manufacturer'] = df.loc[missing, 'model'].map(extract_manufacturer_from_model)
+    
+    if extra_cols:
+        df['extras_json'] = extras
+    
+    # Required fields
+    rule_masks = []
+    rule_messages = []
+    for field, display_name in [('model', 'Model')] + [(f, NUMERIC_FIELDS[f]) for f in REQUIRED_NUMERIC_FIELDS]:
+        if field in df.columns:
+            rule_masks.append(df[field].isna().to_numpy())
+        else:
+            rule_masks.append(np.ones(len(df), dtype=bool))
+        rule_messages.append(f"{display_name} is required")
+    
+    # Collect row errors in row order, then rule order
+    rows, rules = np.nonzero(np.column_stack(rule_masks))
+    errors = [(df.index[row], rule_messages[rule]) for row, rule in zip(rows, rules)]
+    
+    return df, errors
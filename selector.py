@@ -1,12 +1,38 @@
 from typing import List, Dict, Any, Optional, Tuple
 import math
-from db import get_chillers_by_criteria, get_available_ambients
+from operator import itemgetter
+import numpy as np
+from db import get_chillers_by_criteria
+
+# Detail fields shown for a chiller, with their defaults when missing
+_DETAIL_DEFAULTS = {
+    'model': 'Unknown',
+    'manufacturer': 'Unknown',
+    'model_prefix': 'Unknown',
+    'folder_name': 'Unknown',
+    'unit_kw': None,
+    'compressor_kw': None,
+    'fan_kw': None,
+    'iplv_kw_per_ton': None,
+    'mca_amps': None,
+    'pressure_drop_psi': None,
+    'pressure_drop_ftwg': None,
+    'length_in': None,
+    'width_in': None,
+    'height_in': None,
+    'notes': None,
+    'extras_json': None
+}
+_DETAIL_FIELDS = tuple(_DETAIL_DEFAULTS)
+_detail_getter = itemgetter(*_DETAIL_FIELDS)
 
 class ChillerSelector:
     """Handles chiller selection and ranking logic."""
     
     def __init__(self):
         self.capacity_tolerance_levels = [0.10, 0.125, 0.15, 0.175, 0.20]
+        # (lower factor, upper factor, tolerance, percent) for each tolerance level
+        self._tolerance_bounds = tuple((1 - t, 1 + t, t, t * 100) for t in self.capacity_tolerance_levels)
     
     def find_best_chillers(self, capacity_tons: float, ambient_f: int, 
                           ewt_c: Optional[float] = None, lwt_c: Optional[float] = None) -> Dict[str, Any]:
@@ -66,25 +92,26 @@ class ChillerSelector:
                                       ewt_c: Optional[float], lwt_c: Optional[float]) -> Tuple[List[Dict], float, Dict]:
         """Find candidates with progressive tolerance widening."""
         
-        for tolerance in self.capacity_tolerance_levels:
-            candidates = get_chillers_by_criteria(capacity_tons, ambient_f, ewt_c, lwt_c, tolerance)
+        # Query once at the widest tolerance; narrower bands are subsets of it
+        widest_candidates = get_chillers_by_criteria(
+            capacity_tons, ambient_f, ewt_c, lwt_c, self.capacity_tolerance_levels[-1]
+        )
+        candidates, bounds = self._narrow_to_tolerance(widest_candidates, capacity_tons)
+        
+        if candidates:
+            lower, upper, tolerance, tolerance_pct = bounds
+            search_info = {
+                'capacity_tons': capacity_tons,
+                'ambient_f': ambient_f,
+                'ewt_c': ewt_c,
+                'lwt_c': lwt_c,
+                'tolerance_used': tolerance,
+                'tolerance_percent': tolerance_pct,
+                'capacity_range': (capacity_tons * lower, capacity_tons * upper),
+                'candidates_found': len(candidates)
+            }
             
-            if candidates:
-                cap_min = capacity_tons * (1 - tolerance)
-                cap_max = capacity_tons * (1 + tolerance)
-                
-                search_info = {
-                    'capacity_tons': capacity_tons,
-                    'ambient_f': ambient_f,
-                    'ewt_c': ewt_c,
-                    'lwt_c': lwt_c,
-                    'tolerance_used': tolerance,
-                    'tolerance_percent': tolerance * 100,
-                    'capacity_range': (cap_min, cap_max),
-                    'candidates_found': len(candidates)
-                }
-                
-                return candidates, tolerance, search_info
+            return candidates, tolerance, search_info
         
         # No candidates found even with maximum tolerance
         search_info = {
@@ -100,25 +127,42 @@ class ChillerSelector:
         
         return [], self.capacity_tolerance_levels[-1], search_info
     
+    def _narrow_to_tolerance(self, candidates: List[Dict], capacity_tons: float) -> Tuple[List[Dict], Tuple]:
+        """
+        Narrow candidates to the tightest tolerance band that has any matches.
+        Returns (candidates, bounds) where bounds is the matching _tolerance_bounds entry.
+        """
+        
+        for bounds in self._tolerance_bounds:
+            cap_min = capacity_tons * bounds[0]
+            cap_max = capacity_tons * bounds[1]
+            narrowed = [c for c in candidates if cap_min <= c['capacity_tons'] <= cap_max]
+            
+            if narrowed:
+                return narrowed, bounds
+        
+        return [], self._tolerance_bounds[-1]
+    
     def _try_fallback_ambients(self, capacity_tons: float, ewt_c: Optional[float], 
                               lwt_c: Optional[float]) -> List[Dict]:
         """Try to find candidates with fallback ambient temperatures."""
         
-        available_ambients = get_available_ambients()
-        if not available_ambients:
-            return []
+        # Query all ambients once at the widest tolerance and bucket the results by ambient
+        candidates_by_ambient = {}
+        for chiller in get_chillers_by_criteria(capacity_tons, None, ewt_c, lwt_c,
+                                                self.capacity_tolerance_levels[-1]):
+            if chiller['ambient_f'] is not None:
+                candidates_by_ambient.setdefault(chiller['ambient_f'], []).append(chiller)
         
         fallback_results = []
         
-        for ambient in available_ambients:
-            candidates, tolerance, _ = self._find_candidates_with_tolerance(
-                capacity_tons, ambient, ewt_c, lwt_c
-            )
+        for ambient in sorted(candidates_by_ambient):
+            candidates, bounds = self._narrow_to_tolerance(candidates_by_ambient[ambient], capacity_tons)
             if candidates:
                 fallback_results.append({
                     'ambient_f': ambient,
                     'candidates': candidates,
-                    'tolerance_used': tolerance,
+                    'tolerance_used': bounds[2],
                     'count': len(candidates)
                 })
         
@@ -128,41 +172,43 @@ class ChillerSelector:
                         ewt_c: Optional[float], lwt_c: Optional[float]) -> List[Dict]:
         """Rank candidates by capacity delta, temperature score, and efficiency."""
         
-        def calculate_ranking_score(chiller):
-            # Capacity delta (lower is better)
-            cap_delta = abs(chiller.get('capacity_tons', 0) - capacity_tons)
-            
-            # Temperature score (lower is better)
-            temp_score = 0
-            if ewt_c is not None and chiller.get('ewt_c') is not None:
-                temp_score += abs(chiller['ewt_c'] - ewt_c)
-            if lwt_c is not None and chiller.get('lwt_c') is not None:
-                temp_score += abs(chiller['lwt_c'] - lwt_c)
-            
-            # Efficiency (lower is better, but handle nulls)
-            efficiency = chiller.get('efficiency_kw_per_ton')
-            if efficiency is None:
-                efficiency = float('inf')
-            
-            # Waterflow (prefer higher, but handle nulls)
-            waterflow = chiller.get('waterflow_usgpm')
-            if waterflow is None:
-                waterflow = 0  # Sort nulls last
-            
-            return (cap_delta, temp_score, efficiency, -waterflow)
+        if not candidates:
+            return []
+        
+        # Pull the ranking fields out as arrays (missing values become NaN)
+        def column(field, default=None):
+            return np.array([chiller.get(field, default) for chiller in candidates], dtype=np.float64)
         
-        # Sort by ranking score
-        ranked = sorted(candidates, key=calculate_ranking_score)
+        # Capacity delta (lower is better)
+        cap_delta = np.abs(column('capacity_tons', 0) - capacity_tons)
+        
+        # Temperature score (lower is better)
+        temp_score = np.zeros(len(candidates))
+        if ewt_c is not None:
+            ewt_delta = np.abs(column('ewt_c') - ewt_c)
+            temp_score += np.where(np.isnan(ewt_delta), 0, ewt_delta)
+        if lwt_c is not None:
+            lwt_delta = np.abs(column('lwt_c') - lwt_c)
+            temp_score += np.where(np.isnan(lwt_delta), 0, lwt_delta)
+        
+        # Efficiency (lower is better, nulls last)
+        efficiency = column('efficiency_kw_per_ton')
+        efficiency = np.where(np.isnan(efficiency), np.inf, efficiency)
+        
+        # Waterflow (prefer higher, nulls count as 0)
+        waterflow = column('waterflow_usgpm')
+        waterflow = np.where(np.isnan(waterflow), 0, waterflow)
+        
+        # Sort by ranking score; lexsort is stable and takes the primary key last
+        order = np.lexsort((-waterflow, efficiency, temp_score, cap_delta))
+        ranked = [candidates[i] for i in order]
         
         # Add ranking metadata
-        for i, chiller in enumerate(ranked):
-            chiller['_rank'] = i + 1
-            chiller['_cap_delta'] = abs(chiller.get('capacity_tons', 0) - capacity_tons)
-            chiller['_temp_score'] = 0
-            if ewt_c is not None and chiller.get('ewt_c') is not None:
-                chiller['_temp_score'] += abs(chiller['ewt_c'] - ewt_c)
-            if lwt_c is not None and chiller.get('lwt_c') is not None:
-                chiller['_temp_score'] += abs(chiller['lwt_c'] - lwt_c)
+        for rank, (chiller, delta, score) in enumerate(
+                zip(ranked, cap_delta[order].tolist(), temp_score[order].tolist()), start=1):
+            chiller['_rank'] = rank
+            chiller['_cap_delta'] = delta
+            chiller['_temp_score'] = score
         
         return ranked
     
@@ -180,17 +226,24 @@ class ChillerSelector:
         
         best_capacity = ranked_candidates[0].get('capacity_tons', 0)
         
-        # Find candidates above and below the best capacity
-        above_candidates = [c for c in ranked_candidates[1:] if c.get('capacity_tons', 0) > best_capacity]
-        below_candidates = [c for c in ranked_candidates[1:] if c.get('capacity_tons', 0) < best_capacity]
+        # Find the closest candidates above and below the best capacity in one pass
+        above = below = None
+        for candidate in ranked_candidates[1:]:
+            capacity = candidate.get('capacity_tons', 0)
+            if above is None and capacity > best_capacity:
+                above = candidate
+            elif below is None and capacity < best_capacity:
+                below = candidate
+            if above is not None and below is not None:
+                break
         
         # Add closest above capacity
-        if above_candidates:
-            best_options.append(above_candidates[0])
+        if above is not None:
+            best_options.append(above)
         
         # Add closest below capacity
-        if below_candidates:
-            best_options.append(below_candidates[0])
+        if below is not None:
+            best_options.append(below)
         
         return best_options[:3]  # Maximum 3 options
     
@@ -217,7 +270,8 @@ class ChillerSelector:
         
         return " · ".join(summary_parts)
     
-    def format_chiller_display(self, chiller: Dict) -> Dict[str, Any]:
+    @staticmethod
+    def format_chiller_display(chiller: Dict) -> Dict[str, Any]:
         """Format chiller data for display."""
         
         # Main metrics
@@ -230,39 +284,21 @@ class ChillerSelector:
         ewt = chiller.get('ewt_c')
         lwt = chiller.get('lwt_c')
         
-        temp_info = []
-        if ambient is not None:
-            temp_info.append(f"{ambient}°F")
-        if ewt is not None:
-            temp_info.append(f"EWT: {ewt:.1f}°C")
-        if lwt is not None:
-            temp_info.append(f"LWT: {lwt:.1f}°C")
+        temp_parts = (
+            f"{ambient}°F" if ambient is not None else None,
+            f"EWT: {ewt:.1f}°C" if ewt is not None else None,
+            f"LWT: {lwt:.1f}°C" if lwt is not None else None
+        )
+        temp_info = ' / '.join(part for part in temp_parts if part) or 'Unknown'
         
         # Detailed info
-        details = {
-            'model': chiller.get('model', 'Unknown'),
-            'manufacturer': chiller.get('manufacturer', 'Unknown'),
-            'model_prefix': chiller.get('model_prefix', 'Unknown'),
-            'folder_name': chiller.get('folder_name', 'Unknown'),
-            'unit_kw': chiller.get('unit_kw'),
-            'compressor_kw': chiller.get('compressor_kw'),
-            'fan_kw': chiller.get('fan_kw'),
-            'iplv_kw_per_ton': chiller.get('iplv_kw_per_ton'),
-            'mca_amps': chiller.get('mca_amps'),
-            'pressure_drop_psi': chiller.get('pressure_drop_psi'),
-            'pressure_drop_ftwg': chiller.get('pressure_drop_ftwg'),
-            'length_in': chiller.get('length_in'),
-            'width_in': chiller.get('width_in'),
-            'height_in': chiller.get('height_in'),
-            'notes': chiller.get('notes'),
-            'extras_json': chiller.get('extras_json')
-        }
+        details = dict(zip(_DETAIL_FIELDS, _detail_getter({**_DETAIL_DEFAULTS, **chiller})))
         
         return {
             'capacity_tons': capacity,
             'efficiency_kw_per_ton': efficiency,
             'waterflow_usgpm': waterflow,
-            'temp_info': ' / '.join(temp_info) if temp_info else 'Unknown',
+            'temp_info': temp_info,
             'details': details,
             'id': chiller.get('id')
         }